@@ -0,0 +1,2 @@
+from .batch import Batch
+from .job import Job, JobResult, run_job
\ No newline at end of file
@@ -0,0 +1,219 @@
+from concurrent.futures import (ProcessPoolExecutor, as_completed)
+import glob
+import os
+import config
+from .job import (Job, JobResult, describe_error, run_job)
+
+class Batch(object):
+    """
+    Processes many CSVs with a single configuration file. The configuration file is parsed once
+    and reused for every CSV.
+
+    Attributes
+    ----------
+    config_title : str
+        Name of the configuration file without the '.xlsx' extension
+    jobs : list
+        Pairs of [CSV name without the '.csv' extension, output name]
+    workers : int
+        Number of processes the jobs are spread over. 1 runs the jobs one after another.
+    cache : CSVCache or None
+        Cache of cleaned CSV dataframes shared by every job. Nothing is cached if None.
+    """
+
+    def __init__(self, config_title, jobs, workers = 1, cache = None):
+        self.config_title = config_title
+        self.jobs = jobs
+        self.workers = workers
+        self.cache = cache
+
+    @staticmethod
+    def strip_extension(file_name, extension) -> str:
+        """Removes the extension from the file name, if it has one."""
+
+        if (file_name.lower().endswith(extension)):
+            return file_name[:-len(extension)]
+        return file_name
+
+    @staticmethod
+    def default_output_name(input_csv) -> str:
+        """Returns the output name of a CSV that was not given one.
+
+        The suffix keeps the Excel output file from overwriting the Excel version of the CSV.
+        """
+
+        return os.path.basename(input_csv) + '_output'
+
+    @staticmethod
+    def unique_output_names(jobs) -> list:
+        """Returns the jobs with output names that are unique, as jobs with the same output name would
+        overwrite each other's files and directory.
+
+        CSVs of the same name in different directories are given their directory in the output name
+        if they kept the default one, e.g. 'd1/run.csv' and 'd2/run.csv' become 'd1_run_output' and
+        'd2_run_output'.
+
+        Parameters
+        ----------
+        jobs : list
+            Pairs of [CSV name without the '.csv' extension, output name]
+
+        Returns
+        -------
+        list
+            Pairs of [CSV name without the '.csv' extension, output name]
+
+        Raises
+        ------
+        ValueError
+            If output names are still shared, e.g. by the same CSV given twice or by output names
+            given in the manifest
+        """
+
+        unique_jobs = []
+        for input_csv, output_name in jobs:
+            if (Batch._shares_output_name(jobs, output_name)):
+                output_name = Batch._directory_output_name(input_csv, output_name)
+            unique_jobs.append([input_csv, output_name])
+        jobs = unique_jobs
+
+        duplicates = []
+        for input_csv, output_name in jobs:
+            if (Batch._shares_output_name(jobs, output_name) and output_name not in duplicates):
+                duplicates.append(output_name)
+        if (duplicates):
+            raise ValueError('More than one CSV would be written to the same output files: ' + ', '.join(duplicates))
+        return jobs
+
+    @staticmethod
+    def _shares_output_name(jobs, output_name) -> bool:
+        """Returns True if more than one job has the output name, False if not. Names that only differ
+        in case are the same on Windows.
+
+        Helper function to unique_output_names().
+        """
+
+        output_name = os.path.normcase(output_name)
+        return sum(os.path.normcase(name) == output_name for input_csv, name in jobs) > 1
+
+    @staticmethod
+    def _directory_output_name(input_csv, output_name) -> str:
+        """Returns the default output name with the directory of the CSV in front of it. Any other
+        output name is returned as it is.
+
+        Helper function to unique_output_names().
+        """
+
+        if (output_name != Batch.default_output_name(input_csv)):
+            return output_name
+        directory = os.path.splitdrive(os.path.normpath(os.path.dirname(input_csv)))[1]
+        parts = [part for part in directory.replace('\\', '/').split('/') if part not in ('', '.')]
+        return '_'.join(parts + [output_name])
+
+    @staticmethod
+    def find_csvs(patterns) -> list:
+        """Returns the jobs for every CSV matching the glob patterns. Output files are named after the CSV.
+
+        Parameters
+        ----------
+        patterns : list
+            Glob patterns (or plain file names) of the CSVs to process
+
+        Returns
+        -------
+        list
+            Pairs of [CSV name without the '.csv' extension, output name]
+        """
+
+        jobs = []
+        for pattern in patterns:
+            matches = sorted(glob.glob(pattern))
+
+            # Let a missing file be reported when the job runs instead of silently dropping it
+            if (not matches and not glob.has_magic(pattern)):
+                matches = [pattern]
+
+            for match in matches:
+                input_csv = Batch.strip_extension(match, '.csv')
+                jobs.append([input_csv, Batch.default_output_name(input_csv)])
+        return jobs
+
+    @staticmethod
+    def read_manifest(manifest) -> list:
+        """Returns the jobs listed in a manifest file.
+
+        Each line of the manifest holds the name of a CSV, optionally followed by a comma and the
+        name of its output files. Blank lines and lines starting with '#' are ignored.
+
+        Parameters
+        ----------
+        manifest : str
+            File path of the manifest
+
+        Returns
+        -------
+        list
+            Pairs of [CSV name without the '.csv' extension, output name]
+        """
+
+        jobs = []
+        with open(manifest) as lines:
+            for line in lines:
+                line = line.strip()
+                if (line == '' or line.startswith('#')):
+                    continue
+                entry = [item.strip() for item in line.split(',', 1)]
+                input_csv = Batch.strip_extension(entry[0], '.csv')
+                if (len(entry) == 2 and entry[1] != ''):
+                    jobs.append([input_csv, entry[1]])
+                else:
+                    jobs.append([input_csv, Batch.default_output_name(input_csv)])
+        return jobs
+
+    def run(self) -> list:
+        """Runs every job and returns their results.
+
+        With more than one worker, the jobs are spread over a pool of processes. A job that fails
+        is reported and does not stop the others.
+
+        Returns
+        -------
+        list
+            JobResult of every job, in the order the jobs were given
+        """
+
+        job_config = config.load_config(self.config_title + '.xlsx')
+        jobs = [Job(job_config, input_csv, output_name, self.cache) for input_csv, output_name in self.jobs]
+
+        if (self.workers <= 1 or len(jobs) <= 1):
+            results = []
+            for job in jobs:
+                result = run_job(job)
+                print(result)
+                results.append(result)
+        else:
+            results = [None] * len(jobs)
+            with ProcessPoolExecutor(max_workers = min(self.workers, len(jobs))) as executor:
+                futures = {executor.submit(run_job, job): i for i, job in enumerate(jobs)}
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        results[i] = future.result()
+                    except Exception as exception:
+                        # The worker itself died (e.g. out of memory), so the job could not report back
+                        results[i] = JobResult(jobs[i].input_csv, jobs[i].output_name, describe_error(exception), 0.0)
+                    print(results[i])
+
+        self._summary(results)
+        return results
+
+    def _summary(self, results) -> None:
+        """Prints how many jobs succeeded and lists the ones that failed.
+
+        Helper function to run().
+        """
+
+        failures = [result for result in results if not result.succeeded()]
+        print(len(results) - len(failures), 'of', len(results), 'CSVs processed.')
+        for result in failures:
+            print(' ', result)
@@ -0,0 +1,164 @@
+from concurrent.futures import ThreadPoolExecutor
+import time
+import pandas as pd
+import dataframes
+import files
+import directory as dir
+
+# Raw data export, Excel, chart (JPEG/PNG/SVG/PDF), TXT, and Feather writers
+OUTPUT_THREADS = 5
+
+class Job(object):
+    """
+    Processes a single CSV into the output files using an already parsed configuration file.
+
+    Attributes
+    ----------
+    config : Config
+        Compiled configuration file. It is immutable, so the same config is reused for every CSV.
+    input_csv : str
+        Name of the CSV without the '.csv' extension
+    output_name : str
+        Name of the output files
+    cache : CSVCache or None
+        Cache of cleaned CSV dataframes. Nothing is cached if None.
+    """
+
+    def __init__(self, config, input_csv, output_name, cache = None):
+        self.config = config
+        self.input_csv = input_csv
+        self.output_name = output_name
+        self.cache = cache
+
+    def run(self) -> None:
+        """Runs the CSV through the processing pipeline and moves the output files into their directory.
+
+        The Excel version of the CSV is written while the columns are being mapped, and the output
+        files are written concurrently once the mapped data is ready.
+        """
+
+        general_settings = self.config.general
+
+        with ThreadPoolExecutor(max_workers = OUTPUT_THREADS) as executor:
+
+            # Create a dataframe to hold the raw CSV file and then read said dataframe into an Excel file.
+            # The raw dataframe is only read from here on, so the export can overlap the mapping.
+            raw_data_df = dataframes.CSVDataFrame(self.input_csv, pd.DataFrame(), self.config.mapped, general_settings, self.input_csv, self.cache)
+            raw_data_df.create()
+            raw_data_future = executor.submit(raw_data_df.read_into_excel)
+
+            # Match the 'Input' columns to the column labels of this CSV and fill in the default titles
+            mapped_settings = self.config.mapped.resolve(raw_data_df.get_column_labels)
+            raw_data_df.mapped_settings = mapped_settings
+
+            # Store the columns we want mapped into a new dataframe
+            output_df = raw_data_df.map_columns()
+
+            # Convert times into elapsed times
+            raw_data_df.convert_to_elapsed_time(output_df)
+
+            # Decide once which output files are generated. The plan also holds the intermediate
+            # results the output files share, e.g. the chart for the images and the PDF.
+            plan = files.OutputPlan(mapped_settings, general_settings, output_df)
+
+            # Create output files. Every writer only reads output_df.
+            excel_file = files.ExcelFile(mapped_settings, general_settings, output_df, self.output_name, plan)
+            jpeg_file = files.JPEGFile(mapped_settings, general_settings, output_df, self.output_name, plan)
+            png_file = files.PNGFile(mapped_settings, general_settings, output_df, self.output_name, plan)
+            svg_file = files.SVGFile(mapped_settings, general_settings, output_df, self.output_name, plan)
+            pdf_file = files.PDFFile(mapped_settings, general_settings, output_df, self.output_name, plan)
+            txt_file = files.TXTFile(mapped_settings, general_settings, output_df, self.output_name, plan)
+            feather_file = files.FeatherFile(mapped_settings, general_settings, output_df, self.output_name, plan)
+            chart_files = [jpeg_file, png_file, svg_file, pdf_file]
+
+            # Only the writers of the planned output files are run.
+            # The chart is drawn once and can only be saved by one thread at a time,
+            # so the writers that save it share a thread.
+            futures = [raw_data_future]
+            if (plan.excel):
+                futures.append(executor.submit(excel_file.output))
+            if (plan.draw_chart() or plan.pdf):
+                futures.append(executor.submit(self._output_in_order, *chart_files))
+            if (plan.txt):
+                futures.append(executor.submit(txt_file.output))
+            if (plan.feather):
+                futures.append(executor.submit(feather_file.output))
+
+            # Raise the first error of any writer
+            for future in futures:
+                future.result()
+
+        # Create directory and move files. Only the files this job wrote are moved, so leftovers of
+        # earlier runs (e.g. an image format that has since been turned off) or an unrelated workbook
+        # of the same name next to the CSV are left alone.
+        output_files = [raw_data_df, excel_file] + chart_files + [txt_file, feather_file]
+        written_files = [output_file.get_name() for output_file in output_files if output_file.will_output_file()]
+        directory = dir.Directory(self.output_name, *written_files)
+        directory.create()
+
+    @staticmethod
+    def _output_in_order(*output_files) -> None:
+        """Outputs the files one after another, e.g. the files that save the chart.
+
+        Helper function to run().
+        """
+
+        for output_file in output_files:
+            output_file.output()
+
+class JobResult(object):
+    """
+    The outcome of a job.
+
+    Attributes
+    ----------
+    input_csv : str
+        Name of the CSV without the '.csv' extension
+    output_name : str
+        Name of the output files
+    error : str or None
+        Description of why the job failed, None if it succeeded
+    seconds : float
+        Wall-clock time the job took
+    """
+
+    def __init__(self, input_csv, output_name, error, seconds):
+        self.input_csv = input_csv
+        self.output_name = output_name
+        self.error = error
+        self.seconds = seconds
+
+    def succeeded(self) -> bool:
+        """Returns True if the job succeeded, False if not."""
+
+        return self.error is None
+
+    def __str__(self):
+        if (self.succeeded()):
+            return 'Processed {}.csv -> {} ({:.1f} s)'.format(self.input_csv, self.output_name, self.seconds)
+        return 'Failed {}.csv: {}'.format(self.input_csv, self.error)
+
+def describe_error(error) -> str:
+    """Returns a message explaining why a job failed."""
+
+    if (isinstance(error, FileNotFoundError)):
+        return 'No such file: ' + str(error.filename)
+    if (isinstance(error, PermissionError)):
+        return 'Cannot access ' + str(error.filename) + ' as it is currently being used.'
+    if (isinstance(error, TypeError)):
+        return 'Type mismatch! Please make sure your configuration file is compatible with the CSV.'
+    return type(error).__name__ + ': ' + str(error)
+
+def run_job(job) -> JobResult:
+    """Runs a job and reports whether it succeeded. Any exception is caught so the rest of a batch keeps going.
+
+    Module level so it can be sent to worker processes.
+    """
+
+    start = time.perf_counter()
+    try:
+        job.run()
+        error = None
+    except Exception as exception:
+        error = describe_error(exception)
+    return JobResult(job.input_csv, job.output_name, error, time.perf_counter() - start)
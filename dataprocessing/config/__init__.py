@@ -0,0 +1 @@
+from .config import Config, GeneralSettings, MappedSetting, MappedSettings, load_config
@@ -0,0 +1,426 @@
+from dataclasses import dataclass, replace
+from functools import lru_cache
+import os
+import pandas as pd
+
+# Values of the 'Table Policy' general setting and the number of rows the bounded policies keep by default
+TABLE_POLICIES = ('FULL', 'FIRST LAST', 'EVERY', 'SUMMARY')
+DEFAULT_TABLE_SIZE = 1000
+
+# Names of the delimiters of the text file that are hard to type into a cell
+DELIMITER_NAMES = {'TAB': '\t', 'SPACE': ' ', 'COMMA': ',', 'SEMICOLON': ';'}
+
+# Fewest points the 'Chart Points' and 'Excel Chart Points' general settings decimate a chart to
+MIN_CHART_POINTS = 10
+
+# Configuration files compiled per process. Editing a file changes its modification time, so it is compiled again.
+CONFIG_CACHE_SIZE = 16
+
+@dataclass(frozen = True)
+class GeneralSettings(object):
+    """
+    The general settings of the configuration file ('Sheet 2'), with every default filled in.
+
+    Attributes
+    ----------
+    chart_title : str or None
+        Title of the chart. None gives the default title.
+    start_row : int
+        Line number of the column titles in the CSV (the first line is 1)
+    stop_row : int or None
+        Last line number read from the CSV. None reads to the very end.
+    skip_first_row : bool
+        True if the first row of data is skipped
+    x_min : float or None
+        Minimum value on the x-axis of the chart
+    x_max : float or None
+        Maximum value on the x-axis of the chart
+    y_min : float or None
+        Minimum value on the y-axis of the chart
+    y_max : float or None
+        Maximum value on the y-axis of the chart
+    grid_lines : bool
+        True if the chart has grid lines
+    excel : bool
+        True if an Excel file of the processed results is generated
+    jpeg : bool
+        True if a JPEG file of the processed results is generated
+    png : bool
+        True if a PNG file of the chart is generated
+    svg : bool
+        True if an SVG file of the chart is generated
+    pdf : bool
+        True if a PDF file of the processed results is generated
+    txt : bool
+        True if a text file of the processed results is generated
+    feather : bool
+        True if a Feather file of the processed results is generated
+    transpose : bool
+        True if the rows of the CSV are transposed to columns
+    raw_data : bool
+        True if an Excel version of the CSV is generated
+    table_policy : str
+        Which rows of the processed CSV the PDF table holds. One of TABLE_POLICIES:
+        'FULL' (every row), 'FIRST LAST' (the first and last rows), 'EVERY' (every k-th row),
+        or 'SUMMARY' (one row per interval of rows).
+    table_size : int
+        Number of rows the PDF table is bounded to, unless the policy is 'FULL'
+    chart_points : int or None
+        Number of points every series of the chart is decimated to, at most. None plots every row.
+    excel_chart_points : int or None
+        Number of points every series of the Excel chart is decimated to, at most. The decimated rows
+        are written into a 'Chart Data' worksheet. None charts every row of 'Output Data'.
+    txt_delimiter : str
+        Text between the columns of the text file
+    txt_precision : int or None
+        Decimal places of the floats in the text file. None writes them in full.
+    txt_gzip : bool
+        True if the text file is compressed with gzip
+    """
+
+    chart_title: str = None
+    start_row: int = 1
+    stop_row: int = None
+    skip_first_row: bool = False
+    x_min: float = None
+    x_max: float = None
+    y_min: float = None
+    y_max: float = None
+    grid_lines: bool = True
+    excel: bool = True
+    jpeg: bool = True
+    png: bool = False
+    svg: bool = False
+    pdf: bool = True
+    txt: bool = True
+    feather: bool = False
+    transpose: bool = False
+    raw_data: bool = False
+    table_policy: str = 'FULL'
+    table_size: int = DEFAULT_TABLE_SIZE
+    chart_points: int = None
+    excel_chart_points: int = None
+    txt_delimiter: str = '\t'
+    txt_precision: int = None
+    txt_gzip: bool = False
+
+@dataclass(frozen = True)
+class MappedSetting(object):
+    """
+    A row of the mapped settings of the configuration file ('Sheet 1'), i.e. a single mapped CSV column.
+
+    Attributes
+    ----------
+    input_column_number : int
+        Column number of the CSV column (the first column is 1)
+    output_column_number : int
+        Column number of the column in the Excel output file (the first column is 1)
+    format : int or None
+        Decimal places the data is rounded to. None leaves the data as is.
+    time_unit : str or None
+        'D', 'H', 'M', or 'S' if the column holds times that are converted into elapsed times
+    axis : str or None
+        'X' or 'Y' if the column is plotted on the chart
+    title : str or None
+        Title of the column in the output files. Once resolved, defaults to the column label of the CSV.
+    range : str or None
+        Interval of the data that is read in 'start:end' format. None reads every row.
+    input_label : str or None
+        Column label of the CSV column. None until the settings are resolved against a CSV.
+    """
+
+    input_column_number: int
+    output_column_number: int
+    format: int = None
+    time_unit: str = None
+    axis: str = None
+    title: str = None
+    range: str = None
+    input_label: str = None
+
+@dataclass(frozen = True)
+class MappedSettings(object):
+    """
+    The mapped settings of the configuration file ('Sheet 1').
+
+    Attributes
+    ----------
+    columns : tuple
+        MappedSetting of every mapped CSV column, in the order of the configuration file
+    x_axis_index : int or None
+        Index of the column plotted on the x-axis, None if there is no chart
+    y_axis_indices : tuple
+        Indices of the columns plotted on the y-axis, empty if there is no chart
+    """
+
+    columns: tuple
+    x_axis_index: int = None
+    y_axis_indices: tuple = ()
+
+    @property
+    def has_chart(self) -> bool:
+        """Returns True if a chart will be generated, False if not."""
+
+        return self.x_axis_index is not None
+
+    @property
+    def input_column_numbers(self) -> list:
+        """Returns the column numbers of the CSV columns that will be mapped."""
+
+        return [column.input_column_number for column in self.columns]
+
+    @property
+    def input_labels(self) -> list:
+        """Returns the column labels of the CSV columns that will be mapped."""
+
+        return [column.input_label for column in self.columns]
+
+    @property
+    def output_column_numbers(self) -> list:
+        """Returns the column numbers of the columns in the Excel output file."""
+
+        return [column.output_column_number for column in self.columns]
+
+    @property
+    def titles(self) -> list:
+        """Returns the titles of the columns in the output files."""
+
+        return [column.title for column in self.columns]
+
+    @property
+    def ranges(self) -> list:
+        """Returns the intervals of the data that is read from each column."""
+
+        return [column.range for column in self.columns]
+
+    @property
+    def time_indices(self) -> list:
+        """Returns the indices of the columns that are converted into elapsed times."""
+
+        return [i for i, column in enumerate(self.columns) if column.time_unit is not None]
+
+    def resolve(self, col_labels):
+        """Returns a copy of the settings matched to the column labels of a CSV.
+
+        The column label of every mapped CSV column is stored in 'input_label', and columns that
+        were not given a title are titled with their column label.
+
+        Parameters
+        ----------
+        col_labels : pd.Index
+            Column labels of the CSV
+
+        Returns
+        -------
+        MappedSettings
+            Settings with 'input_label' and 'title' filled in
+        """
+
+        columns = []
+        for column in self.columns:
+            label = col_labels[column.input_column_number - 1]
+            title = label if column.title is None else column.title
+            columns.append(replace(column, input_label = label, title = title))
+        return replace(self, columns = tuple(columns))
+
+@dataclass(frozen = True)
+class Config(object):
+    """
+    A compiled configuration file.
+
+    Attributes
+    ----------
+    file_path : str
+        Absolute file path of the configuration file
+    general : GeneralSettings
+        General settings ('Sheet 2')
+    mapped : MappedSettings
+        Mapped settings ('Sheet 1')
+    """
+
+    file_path: str
+    general: GeneralSettings
+    mapped: MappedSettings
+
+def load_config(file_path) -> Config:
+    """Returns the compiled configuration file.
+
+    Both sheets are read in one pass and compiled once per process; the file is only read again
+    once it has been modified.
+
+    Parameters
+    ----------
+    file_path : str
+        File path of the configuration file, including the '.xlsx' extension
+
+    Returns
+    -------
+    Config
+        Settings of the configuration file
+
+    Raises
+    ------
+    ValueError
+        If a setting has a value that is not allowed, e.g. an unknown 'Table Policy'
+    """
+
+    file_path = os.path.abspath(file_path)
+    return _compile_config(file_path, os.stat(file_path).st_mtime_ns)
+
+@lru_cache(maxsize = CONFIG_CACHE_SIZE)
+def _compile_config(file_path, mtime) -> Config:
+    """Reads and compiles the configuration file. The modification time is only part of the cache key.
+
+    Helper function to load_config().
+    """
+
+    sheets = pd.read_excel(file_path, sheet_name = [0, 1], dtype = {'Title': str})
+    general = compile_general_settings(sheets[1])
+    mapped = compile_mapped_settings(sheets[0], general.transpose)
+    return Config(file_path, general, mapped)
+
+def compile_general_settings(df) -> GeneralSettings:
+    """Compiles the general settings sheet of a configuration file.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        'Sheet 2' of the configuration file. Settings are read from the row right below the column titles.
+
+    Returns
+    -------
+    GeneralSettings
+        Settings that were left empty, or are missing from older configuration files, get their default value
+    """
+
+    def value(label):
+        if (label not in df.columns or df.empty or pd.isnull(df[label].iloc[0])):
+            return None
+        return df[label].iloc[0]
+
+    defaults = GeneralSettings()
+    chart_title = value('Chart Title')
+    start_row = value('Start Row')
+    stop_row = value('Stop Row')
+    table_size = value('Table Size')
+    chart_points = value('Chart Points')
+    excel_chart_points = value('Excel Chart Points')
+    txt_precision = value('TXT Precision')
+    return GeneralSettings(
+        chart_title = None if chart_title is None else str(chart_title),
+        start_row = defaults.start_row if start_row is None else int(start_row),
+        stop_row = None if stop_row is None else int(stop_row),
+        skip_first_row = _yes_no(value('Skip First Row'), defaults.skip_first_row),
+        x_min = _number(value('X Min')),
+        x_max = _number(value('X Max')),
+        y_min = _number(value('Y Min')),
+        y_max = _number(value('Y Max')),
+        grid_lines = _yes_no(value('Grid Lines'), defaults.grid_lines),
+        excel = _yes_no(value('Excel'), defaults.excel),
+        jpeg = _yes_no(value('JPEG'), defaults.jpeg),
+        png = _yes_no(value('PNG'), defaults.png),
+        svg = _yes_no(value('SVG'), defaults.svg),
+        pdf = _yes_no(value('PDF'), defaults.pdf),
+        txt = _yes_no(value('TXT'), defaults.txt),
+        feather = _yes_no(value('Feather'), defaults.feather),
+        transpose = _yes_no(value('Transpose'), defaults.transpose),
+        raw_data = _yes_no(value('Raw Data'), defaults.raw_data),
+        table_policy = _table_policy(value('Table Policy'), defaults.table_policy),
+        table_size = defaults.table_size if table_size is None else max(1, int(table_size)),
+        chart_points = None if chart_points is None else max(MIN_CHART_POINTS, int(chart_points)),
+        excel_chart_points = None if excel_chart_points is None else max(MIN_CHART_POINTS, int(excel_chart_points)),
+        txt_delimiter = _delimiter(value('TXT Delimiter'), defaults.txt_delimiter),
+        txt_precision = None if txt_precision is None else max(0, int(txt_precision)),
+        txt_gzip = _yes_no(value('TXT Gzip'), defaults.txt_gzip))
+
+def compile_mapped_settings(df, transpose) -> MappedSettings:
+    """Compiles the mapped settings sheet of a configuration file.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        'Sheet 1' of the configuration file. Each row corresponds to a single mapped CSV column.
+    transpose : bool
+        True if the CSV is transposed, in which case 'Input' holds column numbers instead of column letters
+
+    Returns
+    -------
+    MappedSettings
+        Column letters have been converted into column numbers and the chart axes have been found
+    """
+
+    def value(row, label):
+        if (label not in df.columns or pd.isnull(df[label].iloc[row])):
+            return None
+        return df[label].iloc[row]
+
+    columns = []
+    for row in range(df.shape[0]):
+        input_column = value(row, 'Input')
+        time_unit = value(row, 'Time Unit')
+        axis = value(row, 'Axis')
+        title = value(row, 'Title')
+        round_to = value(row, 'Format')
+        columns.append(MappedSetting(
+            input_column_number = int(input_column) if transpose else _letter2int(input_column),
+            output_column_number = _letter2int(value(row, 'Output')),
+            format = None if round_to is None else int(round_to),
+            time_unit = None if time_unit is None else str(time_unit).upper(),
+            axis = None if axis is None else str(axis).upper(),
+            title = title,
+            range = value(row, 'Range')))
+
+    # A chart is only generated if both axes are indicated
+    x_axis_indices = [i for i, column in enumerate(columns) if column.axis == 'X']
+    y_axis_indices = tuple(i for i, column in enumerate(columns) if column.axis == 'Y')
+    if (not x_axis_indices or not y_axis_indices):
+        return MappedSettings(tuple(columns))
+    return MappedSettings(tuple(columns), x_axis_indices[0], y_axis_indices)
+
+def _yes_no(choice, default) -> bool:
+    """Returns True if the choice is 'Yes', False if it is anything else, and the default if it was left empty."""
+
+    if (choice is None):
+        return default
+    return str(choice).upper() == 'YES'
+
+def _table_policy(policy, default) -> str:
+    """Returns the table policy in the spelling of TABLE_POLICIES, or the default if it was left empty.
+
+    'First/Last', 'first_last' and 'First Last' are all accepted.
+    """
+
+    if (policy is None):
+        return default
+    policy = ' '.join(str(policy).upper().replace('/', ' ').replace('_', ' ').replace('-', ' ').split())
+    if (policy not in TABLE_POLICIES):
+        raise ValueError("'Table Policy' must be one of: Full, First Last, Every, Summary")
+    return policy
+
+def _delimiter(delimiter, default) -> str:
+    """Returns the delimiter of the text file, or the default if it was left empty.
+
+    'Tab', 'Space', 'Comma' and 'Semicolon' stand for their characters; anything else is used as is.
+    """
+
+    if (delimiter is None):
+        return default
+    return DELIMITER_NAMES.get(str(delimiter).upper(), str(delimiter))
+
+def _number(value) -> float or None:
+    """Returns the value as a float, or None if it was left empty."""
+
+    if (value is None):
+        return None
+    return float(value)
+
+def _letter2int(col_letters) -> int:
+    """Converts an Excel column letter into its corresponding column number
+    Source: https://www.geeksforgeeks.org/find-excel-column-number-column-title/
+    """
+
+    result = 0
+    for x in col_letters.upper():
+        result *= 26
+        result += ord(x) - ord('A') + 1
+    return result
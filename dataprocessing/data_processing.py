@@ -1,71 +1,120 @@
-import pandas as pd
-import interface 
-import dataframes 
-import files
-import directory as dir
+import argparse
+import importlib
+import multiprocessing
+import os
+import sys
+import threading
+import interface
 
-if __name__ == '__main__': 
-    repeat = 'y'
-    while (repeat.lower() == 'y'): 
-        try:    
-            user_interface = interface.UserInterface()  
-            user_interface.banner()
-            config_list = user_interface.choose_config()
-            config_sheet_list = config_list[0]
-            config_title = config_list[1]
-            input_csv = user_interface.choose_csv()
-            output_name = user_interface.choose_output_name()
+# The processing modules (and pandas) take a while to import, so they are only imported once they are needed 
+PROCESSING_MODULES = ('batch', 'config', 'dataframes')
+
+def parse_args():
+    """Parses the command line arguments. Without any arguments the program runs interactively."""
 
-            # Read the two sheets of the configuration file: 'General' and 'Mapped' Settings into two different dataframes
-            general_df = dataframes.ExcelDataFrame(config_title, pd.DataFrame(), config_sheet_list.sheetnames[1])
-            general_df.create()
-            mapped_df = dataframes.MappedExcelDataFrame(config_title, pd.DataFrame(), config_sheet_list.sheetnames[0], general_df.get_column('Transpose'))
-            mapped_df.create()
+    parser = argparse.ArgumentParser(description = 'Process CSV files into Excel, JPEG, PDF, and text files.')
+    parser.add_argument('config', nargs = '?',
+                        help = 'Name of the configuration file. Runs in batch mode when given.')
+    parser.add_argument('csvs', nargs = '*',
+                        help = 'CSV files or glob patterns (e.g. "runs/*.csv") to process')
+    parser.add_argument('-m', '--manifest',
+                        help = 'File listing one CSV per line, optionally followed by ",output name"')
+    parser.add_argument('-w', '--workers', type = int, default = os.cpu_count() or 1,
+                        help = 'Number of CSVs processed in parallel (default: number of CPU cores)')
+    parser.add_argument('--cache-dir', default = '.csv_cache',
+                        help = 'Directory of the parsed CSV cache (default: .csv_cache)')
+    parser.add_argument('--cache-size', type = int, default = 1024,
+                        help = 'Size limit of the parsed CSV cache in MB (default: 1024)')
+    parser.add_argument('--no-cache', action = 'store_true',
+                        help = 'Always parse the CSVs instead of reusing cached results')
+    return parser.parse_args()
 
-            # Create a dataframe to hold the raw CSV file and then read said dataframe into an Excel file 
-            raw_data_df = dataframes.CSVDataFrame(input_csv, pd.DataFrame(), mapped_df, general_df, input_csv)
-            raw_data_df.create()
-            raw_data_df.read_into_excel()
+def create_cache(args):
+    """Returns the parsed CSV cache described by the command line arguments, or None if caching is turned off."""
 
-            # Convert the 'Input' and 'Output' column letters into, respectively, column titles and numbers. 
-            # Keep a standalone copy of the 'Output.'
-            mapped_df.format(raw_data_df.get_column_labels)
+    import dataframes
 
-            # Store the columns we want mapped into a new dataframe 
-            output_df = raw_data_df.map_columns()
+    if (args.no_cache):
+        return None
+    return dataframes.CSVCache(args.cache_dir, args.cache_size * 1024**2)
 
-            # Convert times into elapsed times 
-            raw_data_df.convert_to_elapsed_time(output_df)
+def preload_modules():
+    """Imports the processing modules in the background so they are ready once the user is done typing."""
 
-            # Create output files 
-            excel_file = files.ExcelFile(mapped_df,general_df,output_df, output_name)
-            excel_file.output()
+    for module in PROCESSING_MODULES:
+        importlib.import_module(module)
 
-            jpeg_file = files.JPEGFile(mapped_df, general_df, output_df, output_name)
-            jpeg_file.output()
+def run_interactive(args):
+    """Prompts for a configuration file, CSV, and output name until the user is done."""
 
-            pdf_file = files.PDFFile(mapped_df, general_df, output_df, output_name)
-            pdf_file.output()
+    threading.Thread(target = preload_modules, daemon = True).start()
 
-            txt_file = files.TXTFile(mapped_df, general_df, output_df, output_name)
-            txt_file.output()
+    repeat = 'y'
+    while (repeat.lower() == 'y'):
+        try:
+            user_interface = interface.UserInterface()
+            user_interface.banner()
+            config_title = user_interface.choose_config()
+            input_csv = user_interface.choose_csv()
+            output_name = user_interface.choose_output_name()
 
-            # Create directory and move files 
-            directory = dir.Directory(output_name, 
-                                        raw_data_df.get_name(), 
-                                        excel_file.get_name(), 
-                                        jpeg_file.get_name(), 
-                                        pdf_file.get_name(), 
-                                        txt_file.get_name())
-            directory.create()
+            # Waits for the background import if it has not finished yet
+            import batch
+            import config
+
+            # Compiled once and reused until the configuration file is modified
+            job_config = config.load_config(config_title + '.xlsx')
+            batch.Job(job_config, input_csv, output_name, create_cache(args)).run()
 
             repeat = input('Do you want to process another CSV? (y/n): ')
-        except FileNotFoundError as not_found: 
+        except FileNotFoundError as not_found:
             print('No such file:', not_found.filename)
             repeat = input('Do you want to process another CSV? (y/n): ')
-        except PermissionError as per_error: 
+        except PermissionError as per_error:
             print('Cannot access', per_error.filename, 'as it is currently being used.')
             repeat = input('Do you want to process another CSV? (y/n): ')
-        except TypeError: 
+        except TypeError:
             print('Type mismatch! Please make sure your configuration file is compatible with the CSV.')
-            repeat = input('Do you want to process another CSV? (y/n): ')
\ No newline at end of file
+            repeat = input('Do you want to process another CSV? (y/n): ')
+        except ValueError as value_error:
+            # e.g. a setting of the configuration file that has an invalid value
+            print('Invalid value:', value_error)
+            repeat = input('Do you want to process another CSV? (y/n): ')
+
+def run_batch(args):
+    """Processes every CSV given on the command line and/or in the manifest with one configuration file."""
+
+    import batch
+
+    jobs = batch.Batch.find_csvs(args.csvs)
+    if (args.manifest is not None):
+        jobs += batch.Batch.read_manifest(args.manifest)
+    if (not jobs):
+        print('No CSV files to process.')
+        return 1
+    try:
+        jobs = batch.Batch.unique_output_names(jobs)
+    except ValueError as duplicate_error:
+        print(duplicate_error)
+        return 1
+
+    # Every job reports its own errors, so only the errors of the configuration file get here
+    config_title = batch.Batch.strip_extension(args.config, '.xlsx')
+    try:
+        results = batch.Batch(config_title, jobs, args.workers, create_cache(args)).run()
+    except FileNotFoundError as not_found:
+        print('No such file:', not_found.filename)
+        return 1
+    except ValueError as config_error:
+        print('Invalid configuration file:', config_error)
+        return 1
+    return 0 if all(result.succeeded() for result in results) else 1
+
+if __name__ == '__main__':
+    # Worker processes of the frozen executable must not rerun the program
+    multiprocessing.freeze_support()
+    args = parse_args()
+    if (args.config is None):
+        run_interactive(args)
+    else:
+        sys.exit(run_batch(args))
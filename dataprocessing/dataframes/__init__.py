@@ -1,2 +1,3 @@
-from .dataframes import MyDataFrame, ExcelDataFrame, MappedExcelDataFrame
-from .csv_dataframe import CSVDataFrame
\ No newline at end of file
+from .dataframes import MyDataFrame
+from .csv_dataframe import CSVDataFrame
+from .csv_cache import CSVCache
\ No newline at end of file
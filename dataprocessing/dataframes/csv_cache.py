@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import pandas as pd
+from .schema import SchemaCache
+
+# Bump whenever CSVDataFrame.create() changes how a CSV is cleaned, so older entries are not reused
+CACHE_VERSION = 4
+
+class CSVCache(object):
+    """
+    An on-disk cache of cleaned CSV dataframes, stored in the Feather format.
+
+    Entries are keyed by the contents of the CSV and the settings it was read with, so changing
+    anything else in the configuration file (chart settings, titles, output files, ...) reuses the
+    parsed CSV. The least recently used entries are deleted once the cache grows past its size limit.
+
+    Feather needs pyarrow. Without it, nothing is cached.
+
+    Attributes
+    ----------
+    directory : str
+        Directory that holds the cache entries
+    max_bytes : int
+        Size limit of the cache
+    schemas : SchemaCache
+        Schemas of the CSV layouts that have been read, kept in the 'schemas' subdirectory. Unlike
+        the cleaned dataframes, they are reused for CSVs with different contents.
+    """
+
+    def __init__(self, directory = '.csv_cache', max_bytes = 1024**3):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.schemas = SchemaCache(os.path.join(directory, 'schemas'))
+
+    def key(self, csv_file, settings) -> str:
+        """Returns the key of a CSV read with the given settings.
+
+        Parameters
+        ----------
+        csv_file : str
+            File path of the CSV
+        settings : list
+            Settings that change the cleaned dataframe. Must be JSON serializable.
+
+        Returns
+        -------
+        str
+            Hash of the contents of the CSV and the settings
+        """
+
+        digest = hashlib.sha256()
+        digest.update(json.dumps([CACHE_VERSION, settings], default = str).encode())
+        with open(csv_file, 'rb') as csv:
+            for block in iter(lambda: csv.read(1024**2), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def load(self, key) -> list or None:
+        """Returns the cached dataframe and its metadata, or None if the key is not in the cache.
+
+        Parameters
+        ----------
+        key : str
+            Key returned by key()
+
+        Returns
+        -------
+        list or None
+            First element is the dataframe, second element is the metadata dictionary
+        """
+
+        paths = self._paths(key)
+        if (not os.path.isfile(paths[0])):
+            return None
+        try:
+            df = pd.read_feather(paths[0])
+            with open(paths[1]) as metadata_file:
+                metadata = json.load(metadata_file)
+
+            # Mark the entry as recently used
+            os.utime(paths[0])
+        except (ImportError, OSError, ValueError):
+            # pyarrow is missing, or the entry was evicted or left half written by another process
+            return None
+        return [df, metadata]
+
+    def save(self, key, df, metadata) -> None:
+        """Stores a dataframe and its metadata in the cache. Dataframes Feather cannot hold
+        (e.g. columns of mixed types) are not cached.
+
+        Parameters
+        ----------
+        key : str
+            Key returned by key()
+        df : pd.DataFrame
+            Cleaned dataframe of the CSV
+        metadata : dict
+            JSON serializable information that belongs with the dataframe
+        """
+
+        # Write to temporary files first so other processes never read a half written entry
+        paths = self._paths(key)
+        temp_paths = [path + '.' + str(os.getpid()) + '.tmp' for path in paths]
+        try:
+            os.makedirs(self.directory, exist_ok = True)
+            with open(temp_paths[1], 'w') as metadata_file:
+                json.dump(metadata, metadata_file)
+            df.to_feather(temp_paths[0])
+            os.replace(temp_paths[1], paths[1])
+            os.replace(temp_paths[0], paths[0])
+        except Exception:
+            for temp_path in temp_paths:
+                if (os.path.isfile(temp_path)):
+                    os.remove(temp_path)
+            return
+        self._evict()
+
+    def _paths(self, key) -> list:
+        """Returns the file paths of the dataframe and the metadata of a cache entry."""
+
+        path = os.path.join(self.directory, key)
+        return [path + '.feather', path + '.json']
+
+    def _evict(self) -> None:
+        """Deletes the least recently used entries until the cache fits within its size limit.
+
+        Helper function to save().
+        """
+
+        entries = []
+        total_bytes = 0
+        for name in os.listdir(self.directory):
+            if (not name.endswith('.feather')):
+                continue
+            paths = self._paths(name[:-len('.feather')])
+            try:
+                size = sum(os.path.getsize(path) for path in paths if os.path.isfile(path))
+                entries.append([os.path.getmtime(paths[0]), size, paths])
+            except OSError:
+                continue
+            total_bytes += size
+
+        entries.sort()
+        for last_used, size, paths in entries:
+            if (total_bytes <= self.max_bytes):
+                break
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total_bytes -= size
@@ -1,10 +1,34 @@
-from datetime import datetime, timedelta
+from datetime import datetime
 import pandas as pd
 import numpy as np
 from openpyxl import Workbook
-from openpyxl.utils.dataframe import dataframe_to_rows
-from .dataframes import MyDataFrame, ExcelDataFrame, MappedExcelDataFrame
+from .dataframes import MyDataFrame
+from . import dtypes
+from .schema import Schema
 
+# Formats of the str representations of military datetimes found in the CSVs
+MILITARY_TIME_FORMATS = ('%m/%d/%Y %H:%M', '%m/%d/%Y %H:%M:%S', '%m/%d/%Y %H:%M:%S.%f')
+
+# Formats of the str representations of standard datetimes (the output of CSVDataFrame._date_parser)
+STANDARD_TIME_FORMATS = ('%m/%d/%Y %I:%M:%S %p', '%m/%d/%Y %I:%M:%S.%f %p')
+
+# Format of the standard datetimes CSVDataFrame._date_parser converts each format of military datetimes into 
+CONVERTED_TIME_FORMATS = {MILITARY_TIME_FORMATS[0]: STANDARD_TIME_FORMATS[0], 
+                          MILITARY_TIME_FORMATS[1]: STANDARD_TIME_FORMATS[0], 
+                          MILITARY_TIME_FORMATS[2]: STANDARD_TIME_FORMATS[1]}
+
+# Values of a column of strings that are checked for datetimes, spread over the column 
+DATETIME_SAMPLE_SIZE = 10
+
+# pandas units of the time units in the configuration file
+TIME_UNITS = {'H': 'h', 'M': 'm', 'S': 's'}
+
+# Rows of an Excel worksheet and rows written into the Excel version of the CSV at a time 
+EXCEL_MAX_ROWS = 1048576
+EXPORT_CHUNK_ROWS = 10000
+
+# Lookup table to format the hours of many datetimes on a 12 hour clock at once
+HOUR_STRS = np.array([str((hour + 11) % 12 + 1) for hour in range(24)], dtype = object)
 
 
 class CSVDataFrame(MyDataFrame): 
@@ -17,55 +41,76 @@ class CSVDataFrame(MyDataFrame):
         Name of file to be read into CSV 
     df : pd.DataFrame
         Stores the data contained in the file 
-    mapped_settings : MappedExcelDataFrame
-        Contains the mapped settings in the configuration file
-    general_settings : ExcelDataFrame
+    mapped_settings : MappedSettings
+        Contains the mapped settings in the configuration file. Must be resolved against the 
+        column labels of the CSV before the columns are mapped. 
+    general_settings : GeneralSettings
         Contains the general settings of the configuration file 
     input_name : str
         Name of CSV 
+    cache : CSVCache or None
+        Cache of cleaned CSV dataframes. Nothing is cached if None. 
+    schema : Schema or None
+        Schema of the CSV layout, or None if the layout was not known 
+    datetime_formats : dict
+        Format of the str representations of standard datetimes in every column that holds them 
 
     """
 
-    def __init__(self,file_name, df, mapped_settings, general_settings, input_name): 
+    def __init__(self,file_name, df, mapped_settings, general_settings, input_name, cache = None): 
         super().__init__(file_name, df)
         self.mapped_settings = mapped_settings
         self.general_settings = general_settings
         self.input_name = input_name
+        self.cache = cache
+        self.csv_column_labels = None
+        self.row_offset = 0
+        self.schema = None
+        self.datetime_formats = {}
 
     def get_name(self): 
         return self.input_name + '.xlsx'
 
+    @property
+    def get_column_labels(self) -> pd.Index:
+        """Returns the column labels of the CSV, including the columns that were not read."""
+
+        if (self.csv_column_labels is not None): 
+            return self.csv_column_labels
+        return self.df.columns
+
+    def will_output_file(self) -> bool: 
+        """Returns True if the Excel version of the CSV will be generated, False if not. 
+        
+        The Excel version holds every column, so the entire CSV will be read.
+        """
+
+        return self.general_settings.raw_data
+
     def get_start_row(self) -> int:  
         """Returns the first line number to be read from the CSV."""
 
-        start_ser = self.general_settings.get_column('Start Row')
-        if (not start_ser.dropna().empty):
-            # Minus 1 because pandas is zero-indexed  
-            return start_ser.loc[0]-1
-        return 0
+        # Minus 1 because pandas is zero-indexed  
+        return self.general_settings.start_row - 1
 
     def get_stop_row(self) -> int or None: 
         """Returns the last line number to be read from the CSV."""
 
-        stop_ser =  self.general_settings.get_column('Stop Row')
-        if (not stop_ser.dropna().empty): 
-            return stop_ser.loc[0] - self.get_start_row() - 1 
+        stop_row = self.general_settings.stop_row
+        if (stop_row is not None): 
+            return stop_row - self.get_start_row() - 1 
         return None
 
     def is_first_row_skipped(self) -> bool : 
         """Returns True if there is a line number you want to skip that is between the first and 
         last line numbers."""
 
-        skip_ser = self.general_settings.get_column('Skip First Row')
-        if (not skip_ser.dropna().empty and skip_ser.loc[0].upper() == 'YES'):
-            return True
-        return False
+        return self.general_settings.skip_first_row
     
     def is_df_transpose(self) -> str: 
         """Returns "YES" if dataframe is to be transposed, "NO" otherwise."""
         
-        transpose_ser = self.general_settings.get_column('Transpose')
-        if (not transpose_ser.dropna().empty and transpose_ser.loc[0].upper() == 'YES'): 
+        if (self.general_settings.transpose): 
             return 'YES'
         return 'NO'
 
@@ -79,46 +124,143 @@ class CSVDataFrame(MyDataFrame):
         skipLine = self.is_first_row_skipped()
         transpose = self.is_df_transpose()
 
+        # Reuse the cleaned dataframe if the CSV has already been read with the same settings 
+        if (self.cache is not None): 
+            cache_key = self.cache.key(self.file_name + '.csv', self._cache_settings(startLine, stopLine, skipLine, transpose))
+            if (self._load_from_cache(cache_key)): 
+                return
+
         # Read the CSV into the dataframe     
-        self.df = self.df.append(self._read_csv_type(startLine, stopLine, transpose)) 
+        self.df = self.df.append(self._read_csv_type(startLine, stopLine, transpose, skipLine)) 
     
+        # The skipped row of a CSV that is not transposed is never read 
         if (transpose.upper() == 'YES'): 
             #TODO: Ask if N/A marker is to be kept or if the cells that contain it be empty instead. 
             stopLine 
             self.df = self._transpose(startLine, skipLine)
         
-        if (skipLine): 
-           self.df.drop(1, inplace=True)
+            if (skipLine): 
+               self.df.drop(1, inplace=True)
 
-        # Get rid of columns with all whitespace 
-        self.df = self.df.dropna('columns', how='all')
+            # Get rid of columns with all whitespace. The columns are mapped by their position, so only 
+            # the rows of the CSV that are missing altogether are dropped. 
+            self.df = self.df.dropna('columns', how='all')
 
         # Reset index to start at 0 after dropping column(s)
         self.df = self.df.reset_index(drop=True)
         
-        # Search for the columns that have a PM time. (Note: Excel convert str times with a PM time into 
-        # military time. For example, 1:27 PM is converted into 13:27. 
-        datetime_str_columns = self._search_for_military_times()
+        # Search for the columns that have datetimes, most of all PM times. (Note: Excel convert str times with 
+        # a PM time into military time. For example, 1:27 PM is converted into 13:27. 
+        # The schema of the CSV layout already knows them, as long as the columns still hold strings. 
+        if (self.schema is None): 
+            datetime_str_formats = self._search_for_military_times()
+        else: 
+            datetime_str_formats = {column: format for column, format in self.schema.datetime_formats.items() 
+                                    if column in self.df.columns and self.df[column].dtype == object}
            
-        # Format the PM time columns into 12 hour clock format
-        [self._date_parser(self.df[column_name]) for column_name in datetime_str_columns]        
+        # Format the PM time columns into 12 hour clock format, parsing with the format that was found 
+        self.datetime_formats = {}
+        for column_name, format in datetime_str_formats.items(): 
+            if (format in CONVERTED_TIME_FORMATS): 
+                self.df[column_name] = self._date_parser(self.df[column_name], format)
+                format = CONVERTED_TIME_FORMATS[format]
+            self.datetime_formats[column_name] = format
         
-        # Iterates through all the columns in the dataframe and converts the digit object values into their proper datatype
-
+        # Give every column its final dtype in a single pass, with the empty strings as NaN. 
         # Used in particular for: 
         #   a) transposed df: As the transpose() function converts the dtypes of the transposed dataframe all into 
-        #                     objects when the original dtypes were mixed, the while loop converts the 
-        #                     digit values into numeric dtype. 
-        #   b) Columns with empty Strings: The empty String values convert the entire column into an object dtype. 
-        #                     By dropping the empty strings, the column can be converted int numeric dtype.
-        for column in self.df: 
-            self.df[column].replace('', np.nan, inplace=True)
-            self.df[column] = self.df[column].dropna()
-            self.df[column] = pd.to_numeric(self.df[column], errors = 'ignore')
+        #                     objects when the original dtypes were mixed, the digit values are converted into 
+        #                     numeric dtype. 
+        #   b) Memory: Numbers are downcast when no value changes, and strings with few distinct values 
+        #                     are stored as categoricals. 
+        # CSVs of a known layout are inferred too, as the dtypes depend on the values of every CSV, e.g. 
+        # a column with an empty cell in one CSV and only integers in the next. 
+        self.df = dtypes.infer_dtypes(self.df)
+        if (self.schema is None): 
+            self._save_schema(transpose, datetime_str_formats)
+
+        if (self.cache is not None): 
+            self._save_to_cache(cache_key)
+
+    def _cache_settings(self, startLine, stopLine, skipLine, transpose) -> list: 
+        """Returns the settings that change the cleaned dataframe, which are part of its cache key. 
+
+        Besides the general settings, the mapped columns and their 'Range' decide which columns 
+        and rows of the CSV are read. 
+
+        Helper function to create(). 
+        """
+
+        settings = [startLine, stopLine, skipLine, transpose, self.will_output_file()]
+        if (transpose == 'NO'): 
+            settings.append(self.mapped_settings.input_column_numbers)
+            settings.append(self.mapped_settings.ranges)
+        return settings
+
+    def _load_from_cache(self, cache_key) -> bool: 
+        """Fills the dataframe from the cache. Returns True if it was cached, False if not.
+
+        Helper function to create(). 
+        """
+
+        cached = self.cache.load(cache_key)
+        if (cached is None): 
+            return False
+        
+        self.df = cached[0]
+        metadata = cached[1]
+        if (metadata['csv_column_labels'] is not None): 
+            self.csv_column_labels = pd.Index(metadata['csv_column_labels'])
+        self.row_offset = metadata['row_offset']
+        self.datetime_formats = {column: format for column, format in metadata['datetime_formats']}
+        return True
+
+    def _save_to_cache(self, cache_key) -> None: 
+        """Stores the cleaned dataframe in the cache. 
+
+        Helper function to create(). 
+        """
+
+        csv_column_labels = None
+        if (self.csv_column_labels is not None): 
+            csv_column_labels = list(self.csv_column_labels)
+        # Stored as pairs, as JSON objects would turn the column labels into str 
+        datetime_formats = [[column, format] for column, format in self.datetime_formats.items()]
+        self.cache.save(cache_key, self.df, {'csv_column_labels': csv_column_labels, 'row_offset': int(self.row_offset), 
+                                             'datetime_formats': datetime_formats})
+
+    def _load_schema(self, labels) -> Schema or None: 
+        """Returns the schema of the CSV layout if it knows the columns that are read, None if not. 
+
+        Helper function to _read_csv_type(). 
+        """
+
+        if (self.cache is None): 
+            return None
+        schema = self.cache.schemas.load(self.cache.schemas.key(self.csv_column_labels))
+        if (schema is None or not schema.covers(labels)): 
+            return None
+        return schema
+
+    def _save_schema(self, transpose, datetime_str_formats) -> None: 
+        """Stores the schema learned from the cleaned dataframe under the layout of the CSV. The columns 
+        of a transposed CSV only exist after transposing, so it has no schema. 
+
+        Helper function to create(). 
+        """
+
+        if (self.cache is None or transpose == 'YES'): 
+            return
+        schema = Schema.learn(self.df, datetime_str_formats)
+        self.cache.schemas.save(self.cache.schemas.key(self.csv_column_labels), schema)
 
     def read_into_excel(self):  
         """
-        Reads a CSV into an Excel workbook. 
+        Reads a CSV into an Excel workbook, if the Excel version of the CSV is to be generated. 
+
+        The workbook is written row by row in write-only mode, so memory use does not grow with 
+        the number of rows. Rows past the row limit of a worksheet continue on another worksheet 
+        ('Raw Data 2', 'Raw Data 3', ...). 
 
         Parameters
         ----------
@@ -126,20 +268,48 @@ class CSVDataFrame(MyDataFrame):
 
         Returns
         ------- 
-        openpyxl.Workbook
-            Holds the CSV in an Excel file 
+        None 
         """
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = 'Raw Data'
+        if (not self.will_output_file()): 
+            return
+
+        wb = Workbook(write_only = True)
+        header = list(self.df.columns)
+        total_rows = self.df.shape[0]
+
+        # The column titles take up the first row of every worksheet 
+        rows_per_sheet = EXCEL_MAX_ROWS - 1
+        start = 0
+        sheet_number = 1
+        while (sheet_number == 1 or start < total_rows): 
+            if (sheet_number == 1): 
+                ws = wb.create_sheet('Raw Data')
+            else: 
+                ws = wb.create_sheet('Raw Data ' + str(sheet_number))
+            ws.append(header)
 
-        for row in dataframe_to_rows(self.df, index = False, header = True):            
-            ws.append(row)
+            stop = min(start + rows_per_sheet, total_rows)
+            for chunk_start in range(start, stop, EXPORT_CHUNK_ROWS): 
+                for row in self._excel_rows(chunk_start, min(chunk_start + EXPORT_CHUNK_ROWS, stop)): 
+                    ws.append(row)
+            
+            start = stop
+            sheet_number += 1
         
         wb.save(self.input_name + '.xlsx')
 
-    def _read_csv_type(self, startLine, stopLine, transpose):
+    def _excel_rows(self, start, stop) -> list: 
+        """Returns rows 'start' to 'stop' of the dataframe as lists of values that can be written into Excel. 
+        Empty cells are None. 
+
+        Helper function to read_into_excel(). 
+        """
+
+        chunk = self.df.iloc[start:stop]
+        return chunk.astype(object).where(chunk.notnull(), None).values.tolist()
+
+    def _read_csv_type(self, startLine, stopLine, transpose, skipLine):
         """Reads the CSV into a prototype dataframe. 
         Returns the prototype dataframe of the CSV. 
         
@@ -151,6 +321,8 @@ class CSVDataFrame(MyDataFrame):
             Last line number read from CSV
         transpose : str
             Determines whether df is to be transposed 
+        skipLine : bool
+            True if second line number (relative to startLine) is skipped
 
         Returns
         ------- 
@@ -158,22 +330,25 @@ class CSVDataFrame(MyDataFrame):
             Prototype dataframe of the CSV 
         """ 
 
-        # Read to the very end of the file and do not transpose CSV 
-        if (stopLine == None and transpose == 'NO'): 
-            return pd.read_csv(self.file_name+ '.csv', 
-                            skiprows= startLine, 
-                            keep_default_na = False, 
-                            encoding = 'ISO-8859-1')
+        # Do not transpose CSV. Only the columns and rows that will be mapped are parsed, and empty 
+        # cells are read as NaN so the columns get their dtypes right away. 
+        if (transpose.upper() == 'NO'): 
+            rows = self._find_rows(startLine, stopLine, skipLine)
+            usecols = self._find_usecols(startLine)
 
-        # Read to a specific line number and do not transpose CSV 
-        elif (transpose.upper() == 'NO'):
+            # The schema of a known CSV layout holds the formats of its datetimes 
+            labels = self.csv_column_labels if usecols is None else self.csv_column_labels[usecols]
+            self.schema = self._load_schema(labels)
             return pd.read_csv(self.file_name + '.csv', 
-                            skiprows= startLine, 
-                            nrows = stopLine, 
+                            skiprows = rows[0], 
+                            nrows = rows[1], 
+                            usecols = usecols, 
                             keep_default_na = False, 
+                            na_values = [''], 
                             encoding = 'ISO-8859-1')
 
-        # Read to the very end and transpose CSV 
+        # Read to the very end and transpose CSV. Empty cells are kept as empty strings, so the rows 
+        # of the CSV that only hold empty cells are not mistaken for missing rows after transposing. 
         elif (stopLine == None and transpose.upper() == 'YES'): 
             return pd.read_csv(self.file_name + '.csv', 
                             header = None, 
@@ -193,6 +368,116 @@ class CSVDataFrame(MyDataFrame):
                             encoding = 'ISO-8859-1') 
 
     
+    def _find_usecols(self, startLine) -> list or None: 
+        """Returns the positions of the CSV columns that will be mapped, or None if every column is to be read. 
+
+        Only the header of the CSV is read to find them. The column labels of the CSV are kept 
+        so the column letters in the configuration file still refer to the columns of the entire CSV. 
+
+        Helper function to _read_csv_type(). 
+
+        Parameters
+        ----------
+        startLine : int
+            First line number read from CSV 
+
+        Returns
+        ------- 
+        list or None
+            Positions (zero-indexed) of the columns to be read 
+        """
+
+        header = pd.read_csv(self.file_name + '.csv', 
+                            skiprows = startLine, 
+                            nrows = 0, 
+                            encoding = 'ISO-8859-1')
+        self.csv_column_labels = header.columns
+        
+        if (self.will_output_file()): 
+            return None
+
+        # Column numbers past the last column are reported when the mapped settings are resolved 
+        positions = {number - 1 for number in self.mapped_settings.input_column_numbers}
+        return sorted(position for position in positions if 0 <= position < header.columns.size)
+
+    def _find_rows(self, startLine, stopLine, skipLine) -> list: 
+        """Returns the skiprows and nrows arguments that read only the rows of the CSV that will be mapped. 
+
+        Data rows are counted from 0, starting right below the column titles. The first data row is 
+        always read as the elapsed times are measured from it. Beyond that, only the union of the 
+        'Range' intervals of the mapped columns is read; pandas stops reading once nrows is reached. 
+        When the rows before the intervals are skipped, self.row_offset is set so the intervals can 
+        still be found in the dataframe. 
+
+        Helper function to _read_csv_type(). 
+
+        Parameters
+        ----------
+        startLine : int
+            First line number read from CSV 
+        stopLine : int or None
+            Number of data rows to read 
+        skipLine : bool
+            True if second line number (relative to startLine) is skipped
+
+        Returns
+        ------- 
+        list
+            First element gives skiprows, second element gives nrows 
+        """
+
+        # The skipped row is data row 1. Data row 'first_row' onwards (up to 'last_row') are read. 
+        shift = 1 if skipLine else 0
+        first_row = 1 + shift
+        last_row = stopLine
+
+        # The Excel version of the CSV holds every row 
+        if (not self.will_output_file()): 
+            window = self._find_row_window()
+            if (window[1] is not None): 
+                stop = window[1] + shift
+                last_row = stop if last_row is None else min(last_row, stop)
+            if (window[0] > 1): 
+                first_row = window[0] + shift
+                self.row_offset = window[0] - 1
+
+        # Number of rows between data row 0 and data row 'first_row' that are not read 
+        skipped = first_row - 1
+        if (last_row is not None): 
+            skipped = max(0, min(first_row, last_row) - 1)
+            last_row = last_row - skipped
+
+        if (skipped == 0): 
+            return [startLine, last_row]
+        if (skipped == 1): 
+            return [list(range(startLine)) + [startLine + 2], last_row]
+        
+        first_data_line = startLine + 1
+        return [lambda line: line < startLine or 1 <= line - first_data_line < first_row, last_row]
+
+    def _find_row_window(self) -> list: 
+        """Returns the union of the 'Range' intervals of the mapped columns. 
+
+        Helper function to _find_rows(). 
+
+        Returns
+        ------- 
+        list
+            First element gives the starting row index, second element gives the ending row 
+            index or None if at least one column is read to the very end 
+        """
+
+        starts = []
+        ends = []
+        for current_range in self.mapped_settings.ranges: 
+            range_list = self._find_range(current_range, np.inf)
+            starts.append(range_list[0])
+            ends.append(range_list[1])
+        
+        if (max(ends) == np.inf): 
+            return [min(starts), None]
+        return [min(starts), int(max(ends))]
+
     def _transpose(self, startLine, skipLine): 
             """
             Transpose the dataframe.  
@@ -218,10 +503,14 @@ class CSVDataFrame(MyDataFrame):
             
             return self.df
        
-    def _search_for_military_times(self): 
+    def _search_for_military_times(self) -> dict: 
         """
         Goes through the self.df and searches for series whose values are 
-        str representations of miltiary datetimes 
+        str representations of military or standard datetimes. 
+
+        Only columns of strings are searched. Several values spread over each column are checked, 
+        so blank cells or a stray value at the top of a column do not hide its datetimes. A column 
+        holds datetimes if every checked value matches one of the formats. 
 
         Parameters 
         ----------
@@ -229,35 +518,65 @@ class CSVDataFrame(MyDataFrame):
         
         Returns
         -------
-        list
-            Contains the column labels of the columns with str representations of military datetimes
+        dict
+            Format that most of the checked values of each column with str representations of 
+            datetimes match, keyed by the column label. Military datetimes have one of the 
+            MILITARY_TIME_FORMATS, standard datetimes one of the STANDARD_TIME_FORMATS. 
         """
 
-        datetime_str_column = []
-        i = 0
-        for column in self.df: 
-            series = self.df[column]
-            for format in ('%m/%d/%Y %H:%M', '%m/%d/%Y %H:%M:%S', '%m/%d/%Y %H:%M:%S.%f'): 
-                datetime_str = str(series.loc[0])
+        datetime_str_formats = {}
+        for column, series in self.df.items(): 
+            if (series.dtype != object): 
+                continue
+            values = series[series.notnull() & (series != '')]
+            if (values.size == 0): 
+                continue
+            sample = np.unique(np.linspace(0, values.size - 1, DATETIME_SAMPLE_SIZE).astype(np.int64))
+            format = self._match_datetime_format([str(value) for value in values.iloc[sample]])
+            if (format is not None): 
+                datetime_str_formats[column] = format
+    
+        return datetime_str_formats
+
+    def _match_datetime_format(self, datetime_strs) -> str or None: 
+        """Returns the datetime format that most of the strings match, or None if any string is not 
+        a datetime. 
+
+        Helper function to _search_for_military_times(). 
+        """
+
+        matches = dict.fromkeys(MILITARY_TIME_FORMATS + STANDARD_TIME_FORMATS, 0)
+        for datetime_str in datetime_strs: 
+            for format in matches: 
                 try: 
                     datetime.strptime(datetime_str, format)
-                    datetime_str_column.append(column)
                 except ValueError: 
                     continue
-                i += 1
-    
-        return datetime_str_column
+                matches[format] += 1
+                break
+            else: 
+                return None
+        return max(matches, key = matches.get)
         
     
-    def _date_parser(self, datetime_str_series) -> pd.Series:
+    def _date_parser(self, datetime_str_series, format = MILITARY_TIME_FORMATS[0]) -> pd.Series:
         """
         Converts a series that holds string representations of military datetime into 
         a series that holds string representations of standard datetime.   
+
+        Every value is parsed once with an explicit format, so the conversion is linear in 
+        the length of the series. Values that are not military datetimes are left as they are. 
+        Only the hour is rewritten and the period added. The date, minutes, seconds, and fraction 
+        of a second are kept as they are written, and seconds are added to the times without them, 
+        e.g. '02/05/2018 13:27' becomes '02/05/2018 1:27:00 PM'. 
          
         Parameters
         ---------- 
         datetime_str_series : pd.Series
             Contains military times 
+        format : str
+            Format of most of the military times, which is tried first. Values that do not match 
+            it are tried with the other MILITARY_TIME_FORMATS. 
         
         Returns
         -------
@@ -265,36 +584,33 @@ class CSVDataFrame(MyDataFrame):
             Str representation of standard datetime 
         """
         
-        # Drop empty columns so you don't get an index out of range error 
-        datetime_str_pm = datetime_str_series.replace('', np.nan).dropna()
+        # Parse with each format in turn; only the values that have not matched yet are retried 
+        datetimes = pd.Series(pd.NaT, index = datetime_str_series.index, dtype = 'datetime64[ns]')
+        for format in _formats_from(format, MILITARY_TIME_FORMATS): 
+            unparsed = datetimes.isnull()
+            if (not unparsed.any()): 
+                break
+            datetimes[unparsed] = pd.to_datetime(datetime_str_series[unparsed], format = format, errors = 'coerce')
         
-        period = 'AM'
-        for datetime_str in datetime_str_pm:  
-            
-            datetime_str_list = datetime_str.split()
-            date = datetime_str_list[0]
-            time = datetime_str_list[1]
-            time_list = time.split(':')
-            
-            # Grab the hours
-            hours = int(time_list[0])
-            if (hours == 12): 
-                period = 'PM'
-            if (hours > 12): 
-                hours = str(hours-12)
-            
-            # Grab the minutes
-            minutes = time_list[1]
-
-            # Grab the seconds 
-            if (len(time_list) == 3): 
-                seconds = time_list[2]
-            else: 
-                seconds = '00'
-            
-            # Replace
-            new_str = date + ' ' + str(hours) + ':' +  minutes + ':' +  seconds + ' ' + period  
-            datetime_str_series.replace(datetime_str, new_str, inplace=True)
+        parsed = datetimes.notnull()
+        if (not parsed.any()): 
+            return datetime_str_series
+        datetimes = datetimes[parsed]
+
+        # Each row gets its own period; 0:00 is 12 AM and 12:00 is 12 PM 
+        hours = datetimes.dt.hour.to_numpy()
+        periods = np.where(hours < 12, ' AM', ' PM')
+
+        # Replace the hour of every datetime, which is the text between the date and the first colon 
+        standard_strs = []
+        for datetime_str, hour, period in zip(datetime_str_series[parsed].tolist(), HOUR_STRS[hours], periods): 
+            date_hour, minutes_seconds = datetime_str.split(':', 1)
+            if (':' not in minutes_seconds): 
+                minutes_seconds += ':00'
+            standard_strs.append(date_hour.rsplit(' ', 1)[0] + ' ' + hour + ':' + minutes_seconds + period)
+
+        datetime_str_series = datetime_str_series.copy()
+        datetime_str_series[parsed] = standard_strs
         return datetime_str_series
 
     def map_columns(self) -> pd.DataFrame: 
@@ -302,55 +618,51 @@ class CSVDataFrame(MyDataFrame):
         to the output files. 
         """
 
-        title_inputs =  self.mapped_settings.get_column('Input')
-        new_titles = self.mapped_settings.get_column('Title')
-        range_inputs = self.mapped_settings.get_column('Range')
-        format = self.mapped_settings.get_column('Format')
-        raw_data = self.df.copy()
+        title_inputs = self.mapped_settings.input_labels
+        new_titles = self.mapped_settings.titles
+        range_inputs = self.mapped_settings.ranges
+        format = [column.format for column in self.mapped_settings.columns]
+        raw_data = self.df
     
         # Initialize the dataframe that store the mapped values 
         mapped_df = pd.DataFrame()
         
-        # Find size of dataframe column  
-        max_size = raw_data.iloc[:,0].size
+        # Find size of dataframe column. Rows before the mapped intervals may not have been read. 
+        max_size = raw_data.iloc[:,0].size + self.row_offset
         
         # Determine the column with the largest range interval, whose index will be used for the entire dataframe. 
+        # It is stored first so the other columns are aligned to it. 
         interval_index = self._largest_interval(range_inputs, max_size)
-        range_list = self._find_range(range_inputs.loc[interval_index],max_size)
-        start = range_list[0]
-        end = range_list[1]
-        mapped_df[title_inputs.loc[interval_index]] = raw_data[title_inputs.loc[interval_index]].iloc[start:end].reset_index(drop = True)
-        if (not pd.isnull(format.iloc[interval_index]) and type(format.iloc[interval_index]) == np.float64):
-            mapped_df[title_inputs.loc[interval_index]] = self._round_numbers(raw_data[title_inputs.loc[interval_index]], int(format.iloc[interval_index]))
-        mapped_df.rename({title_inputs.loc[interval_index]: new_titles.iloc[interval_index]}, axis = 'columns', inplace=True)
-
-        # Drop the rows/columns that have already been used above
-        raw_data = raw_data.drop([title_inputs.loc[interval_index]], axis = 1)
-        title_inputs = title_inputs.drop(labels = interval_index).reset_index(drop = True)
-        range_inputs = range_inputs.drop(labels = interval_index).reset_index(drop = True)
-        format = format.drop(labels = interval_index).reset_index(drop = True)
-        new_titles = new_titles.drop(labels = interval_index).reset_index(drop = True)
+        order = [interval_index] + [i for i in range(len(range_inputs)) if i != interval_index]
 
         # Store all the data to be processed into a dataframe and append each new column to the dataframe 
-        for i in range(len(range_inputs)): 
-            range_list = self._find_range(range_inputs.loc[i],max_size)
-            start = range_list[0]
-            end = range_list[1]
-            new_series = raw_data[title_inputs.loc[i]].iloc[start:end].reset_index(drop = True)
+        for i in order: 
+            range_list = self._find_range(range_inputs[i],max_size)
+            start = range_list[0] - self.row_offset
+            end = range_list[1] - self.row_offset
+            new_series = raw_data[title_inputs[i]].iloc[start:end].reset_index(drop = True)
+
+            # Categoricals only save memory while the CSV is held; the output files work on plain values 
+            if (pd.api.types.is_categorical_dtype(new_series)): 
+                new_series = new_series.astype(object)
             
             # Round numbers
-            if (not pd.isnull(format.iloc[i]) and type(format.iloc[i]) == np.float64):
-                new_series = self._round_numbers(new_series, int(format.iloc[i]))
-            mapped_df[title_inputs.loc[i]] = new_series
+            if (format[i] is not None):
+                new_series = self._round_numbers(new_series, format[i])
             
-            # Rename column titles
-            mapped_df.rename({title_inputs.loc[i]: new_titles.loc[i]}, axis = 'columns', inplace=True)
+            # Store the column under its new title 
+            mapped_df[new_titles[i]] = new_series
 
         return mapped_df
     
     def _round_numbers(self, series, round_to) -> pd.Series: 
-        """ Round numbers in the series to the number of decimal places indiciated by 'round_to.'"""
+        """ Round numbers in the series to the number of decimal places indiciated by 'round_to.'
 
+        Downcast floats are rounded as float64, as most rounded decimals cannot be held exactly by float32. 
+        """
+
+        if (series.dtype == np.float32): 
+            series = series.astype(np.float64)
         series = series.round(round_to)
         return series
     
@@ -359,7 +671,7 @@ class CSVDataFrame(MyDataFrame):
 
         Parameters
         ---------- 
-        range_inputs : pd.Series
+        range_inputs : list
             Interval of data set we want read into each processed CSV column
         max_size : int 
             Size of the CSV column 
@@ -367,14 +679,14 @@ class CSVDataFrame(MyDataFrame):
         Returns
         ------- 
         int
-            Row label of the CSV column with the largest set interval 
+            Index of the CSV column with the largest set interval 
         """ 
         
         max_interval = 0
         max_interval_index = 0
         i = 0
-        while (i < range_inputs.size): 
-            range_list = self._find_range(range_inputs.iloc[i],max_size)
+        while (i < len(range_inputs)): 
+            range_list = self._find_range(range_inputs[i],max_size)
             range_difference = range_list[1]-range_list[0]
             if (range_difference > max_interval): 
                 max_interval = range_difference
@@ -430,8 +742,10 @@ class CSVDataFrame(MyDataFrame):
         return [start,end]
     
     def convert_to_elapsed_time(self, output_df):
-        """Returns output_df with the str representations of datetime objects converted into 
-        timedelta objects. 
+        """Returns output_df with the time columns converted into elapsed times. 
+
+        Each column is converted in one vectorized subtraction into a timedelta64[ns] column. 
+        Elapsed times are measured from the first value of the time column in the CSV. 
         
         Parameters
         ---------- 
@@ -444,47 +758,24 @@ class CSVDataFrame(MyDataFrame):
             Time columns are converted into elapsed times
         """ 
 
-        # Grab the time units of the columns whose values is to be converted into elapsed times 
-        time_units_df = self.mapped_settings.get_column('Time Unit').dropna()
-
-        # If there are time values that need to be reformatted...
-        if (not time_units_df.empty): 
+        # Iterate through all the time columns 
+        for i in self.mapped_settings.time_indices: 
+            column = self.mapped_settings.columns[i]
             
-            # 'index' contains the indices of the time columns in mapped_settings ('Sheet 1' of the configuration file) 
-            all_time_indices = time_units_df.index.values
-            all_time_titles = self.mapped_settings.get_column('Input Column Numbers')
-            
-            # Iterate through all the time columns 
-            for i in range(time_units_df.size): 
-                
-                # Grab the time unit of the column  
-                unit = time_units_df.iloc[i]
-                
-                # Retrieve the original column title of the 'time' column. This is needed to find the starting time, especially
-                # when the range of the mapped data set has been limited.  
-                time_index = all_time_titles.loc[all_time_indices[i]]
-                time_title = super().get_column_labels[time_index-1]
-                
-                # Retrieve the start time and convert it to a series of length 1 and type str in elapsed time format.  
-                start_time = self._convert_to_elapsed_time_str_series(pd.Series(super().get_column(time_title).loc[0]), unit)
-
-                # Create an empty df
-                new_time_col = pd.DataFrame()
-                
-                # Retrieve the new title of the time column so you can retrieve its data set in output_df 
-                new_time_title = self.mapped_settings.get_column('Title').loc[time_units_df.index[i]]
-            
-                # Convert the values in the column into elapsed times 
-                new_time_col = self._convert_to_elapsed_time_str_series(output_df[new_time_title], unit)
-                self._convert_to_timedelta(new_time_col, start_time.loc[0])
-                output_df[new_time_title] = new_time_col
+            # Retrieve the start time from the original CSV column. This is needed when the range of the mapped 
+            # data set has been limited. 
+            format = self.datetime_formats.get(column.input_label)
+            start_time = self._to_time(super().get_column(column.input_label).iloc[:1], column.time_unit, format).iloc[0]
+        
+            # Convert the values in the column into elapsed times 
+            output_df[column.title] = self._to_time(output_df[column.title], column.time_unit, format) - start_time
 
         return output_df
 
-    def _convert_to_elapsed_time_str_series(self, series, unit):
-        """Converts the values in a series into str representations of timedelta objects.  
+    def _to_time(self, series, unit, format = None) -> pd.Series:
+        """Converts the values in a series into points in time that can be subtracted from each other.  
 
-        Helper function to convert_to_elapsed_time(). 
+        Helper function to convert_to_elapsed_time(). Milliseconds are removed. 
 
         Parameters
         ---------- 
@@ -494,116 +785,42 @@ class CSVDataFrame(MyDataFrame):
         unit : str
             The unit of time of the CSV column. D = datetime, H = hours, M = minutes, 
             S = seconds
+        format : str or None
+            Format of the datetimes found by _search_for_military_times(), which is tried first. 
+            None if it is not known. 
 
         Returns
         ------- 
         pd.Series 
-            Contains a str representation of a timedelta object in %H:%M:%S format 
+            Contains datetime64[ns] values if the unit is D, timedelta64[ns] values otherwise 
         """
 
-        series = series.dropna()
-
-        #FIXME: Takes up too much space 
-        # Creating a copy of 'series' to be iterated over. That way even if two cells have the same datetime, 
-        # and both cells are replaced in the original 'series,' the for loop will not break when we iterate 
-        # over the second copy.  
-        series_copy = series.copy()
-
         # If the time series is a datetime object....
         if (unit.upper() == 'D'): 
-            for cur_datetime in series_copy: 
-                
-                # Split the datetime object into a list by a space delimiter and store the %H:%M:%S  
-                # portion into a variable 
-                cur_datetime_list = cur_datetime.split()
-                cur_time_list = cur_datetime_list[1].split('.')
-                cur_time = cur_time_list[0]
-                series.replace(cur_datetime, cur_time, inplace = True)
+            times = pd.Series(pd.NaT, index = series.index, dtype = 'datetime64[ns]')
+            for format in _formats_from(format, STANDARD_TIME_FORMATS): 
+                unparsed = times.isnull() & series.notnull()
+                if (not unparsed.any()): 
+                    break
+                times[unparsed] = pd.to_datetime(series[unparsed], format = format, errors = 'coerce')
             
+            # Fall back on letting pandas infer the format of anything else 
+            unparsed = times.isnull() & series.notnull()
+            if (unparsed.any()): 
+                times[unparsed] = pd.to_datetime(series[unparsed], errors = 'coerce')
+
         #If the time series is in hours, minutes, or seconds...
         else:
-            for time in series_copy: 
-                time_list = self._get_hours_minutes_seconds(time, unit)
-                cur_time = str(time_list[0]) + ':' + str(time_list[1]) + ':' + str(time_list[2])
-                series.replace(time, cur_time, inplace = True)
-        return series
-    
-    def _get_hours_minutes_seconds(self, time, time_unit):
-        """Splits a single time unit into its hours, minutes, and seconds. 
-
-        Takes in a float representation of a a single unit of time, converts it into an integer, and 
-        returns a list of the original time in %H:%M:%S format. 
-
-        Helper function to convert_to_elapsed_times(). 
-
-        Parameters
-        ---------- 
-        time : float 
-            Given time to be converted
-        time_unit : str
-            The unit of time that the given 'time' is in
-
-        Returns: 
-        list
-            Holds the hours, minutes, and seconds of the given 'time' 
-        """
+            times = pd.to_timedelta(pd.to_numeric(series, errors = 'coerce'), unit = TIME_UNITS[unit.upper()])
         
-        if (time_unit.upper() == 'H'): 
-            time = time * 3600
-        elif (time_unit.upper() == 'M'): 
-            time = time * 60    
-        time = int(time)
-        hours = time // 3600 
-        time = time % 3600
-        minutes = time // 60 
-        seconds = time % 60
-        
-        return [hours,minutes,seconds]
-
-    def _convert_to_timedelta(self, time_series, start_time): 
-        """Converts values in a series into timedelta objects. 
+        return times.dt.floor('S')
 
-        Helper function to convert_to_elapsed_times(). 
+def _formats_from(format, formats) -> tuple: 
+    """Returns the formats with 'format' moved to the front, as most values match the format of their column. 
 
-        Parameters
-        ----------
-        time_series : pd.Series
-            Contains str representations of timedelta objects.  
-        start_time : str
-            Str representation of starting time in the original dataframe
-
-        Returns
-        ------- 
-        None  
-        """
-
-        time_series_modified = time_series.dropna()
-        start_time = pd.to_timedelta(start_time)
-
-        # Iterate through 'time_series_modified' which has the NaN values dropped. 
-        # Should still replace the str representation with the timedelta object in 
-        # the original 'time_series'
-        for current_time in time_series_modified: 
-            
-            # Convert the str 'current_time' into a timedelta object and find the difference between 'current_time' and 'start_time'
-            # to find the elapsed time. Convert the difference between the two times into a str and use the space 
-            # delimiter to split it into a list. 
-            difference= str(pd.to_timedelta(current_time)-start_time)
-            difference_list = difference.split()
-            
-            # Store the time portion of the str into 'elapsed_time' and use the colon delimiter to 
-            # split the time into a list.  
-            elapsed_time = difference_list[2]
-            elapsed_time_list = elapsed_time.split(':')
-            
-            # Convert each element in the list into an integer and use the elements to produce a timedelta object 
-            time = timedelta(hours = int(elapsed_time_list[0]), minutes = int(elapsed_time_list[1]), seconds = int(elapsed_time_list[2]))            
-            
-            # Replace 'current_time' with 'time' in 'time_series'
-            time_series.replace(current_time, time, inplace = True)
-    
-
-    
-            
+    Helper function to CSVDataFrame._date_parser() and CSVDataFrame._to_time(). 
+    """
 
-   
\ No newline at end of file
+    if (format is None): 
+        return formats
+    return (format,) + tuple(other for other in formats if other != format)
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+# String columns whose distinct values are at most this share of their values are stored as categoricals
+CATEGORY_MAX_RATIO = 0.5
+
+def infer_dtypes(df) -> pd.DataFrame:
+    """Returns the dataframe with every column converted into its final dtype in a single pass.
+
+    - Empty strings become NaN. Empty cells are best read as NaN in the first place, e.g. with
+      pd.read_csv(na_values = ['']), which leaves nothing to replace.
+    - Columns whose every value is a number become numeric, like pd.to_numeric(errors = 'ignore').
+    - Integers are downcast to the smallest integer dtype that holds them.
+    - Floats become float32 if every value is exactly the same in float32, and stay float64 otherwise.
+    - String columns with few distinct values become categoricals, every other column stays as it is.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe of the CSV
+
+    Returns
+    -------
+    pd.DataFrame
+        Dataframe of the CSV with the same column labels and index
+    """
+
+    if (df.shape[1] == 0):
+        return df
+
+    # Columns are taken by position, as the column labels of a transposed CSV may repeat
+    inferred = pd.concat([infer_column(df.iloc[:, j]) for j in range(df.shape[1])], axis = 1)
+    inferred.columns = df.columns
+    return inferred
+
+def infer_column(column) -> pd.Series:
+    """Returns the column converted into its final dtype. See infer_dtypes().
+
+    Parameters
+    ----------
+    column : pd.Series
+        Column of the CSV
+
+    Returns
+    -------
+    pd.Series
+        Column with the same values and index
+    """
+
+    if (column.dtype == object):
+        empty = (column == '').to_numpy()
+        if (empty.any()):
+            column = column.mask(empty)
+
+        # Any value that is not a number keeps the column as strings. Parsing stops at the first one.
+        try:
+            column = pd.to_numeric(column)
+        except (ValueError, TypeError):
+            return _categorize(column)
+
+    return downcast(column)
+
+def downcast(column) -> pd.Series:
+    """Returns an integer column as the smallest integer dtype that holds it, and a float column as
+    float32 if none of its values change. Any other column is returned as it is.
+
+    Parameters
+    ----------
+    column : pd.Series
+        Column of the CSV
+
+    Returns
+    -------
+    pd.Series
+        Column with the same values and index
+    """
+
+    if (pd.api.types.is_bool_dtype(column)):
+        return column
+    if (pd.api.types.is_integer_dtype(column)):
+        return pd.to_numeric(column, downcast = 'integer')
+    if (pd.api.types.is_float_dtype(column)):
+        return _downcast_float(column)
+    return column
+
+def _downcast_float(column) -> pd.Series:
+    """Returns a float column as float32 if none of its values change, otherwise as it is.
+
+    Helper function to downcast().
+    """
+
+    values = column.to_numpy()
+    if (values.dtype != np.float64):
+        return column
+    with np.errstate(over = 'ignore'):
+        float32_values = values.astype(np.float32)
+    if (not np.array_equal(float32_values.astype(np.float64), values, equal_nan = True)):
+        return column
+    return pd.Series(float32_values, index = column.index, name = column.name)
+
+def _categorize(column) -> pd.Series:
+    """Returns a string column as a categorical if it has few distinct values, otherwise as it is.
+
+    Helper function to infer_column().
+    """
+
+    values = column.count()
+    if (values == 0 or column.nunique() > CATEGORY_MAX_RATIO * values):
+        return column
+    return column.astype('category')
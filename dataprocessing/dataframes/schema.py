@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+
+# Bump whenever the schema changes how a CSV is parsed or what is stored, so older schemas are not reused
+SCHEMA_VERSION = 3
+
+class Schema(object):
+    """
+    The columns of a CSV that have been read and the formats of the datetimes they hold. CSVs of the
+    same layout reuse the datetime formats instead of searching for them again.
+
+    Dtypes are not part of the schema, as they depend on the values: a column with an empty cell is
+    float in one CSV and integer in the next. CSVs of a known layout are inferred like any other CSV.
+
+    Attributes
+    ----------
+    labels : list
+        Labels of the columns that have been read
+    datetime_formats : dict
+        Format of the str representations of datetimes of every column label that holds them
+    """
+
+    def __init__(self, labels, datetime_formats):
+        self.labels = labels
+        self.datetime_formats = datetime_formats
+
+    @classmethod
+    def learn(cls, df, datetime_formats):
+        """Returns the schema of a cleaned dataframe.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Dataframe of the CSV
+        datetime_formats : dict
+            Format of the str representations of datetimes of every column label that holds them,
+            as found before they were converted
+        """
+
+        return cls([str(label) for label in df.columns],
+                   {str(label): format for label, format in datetime_formats.items()})
+
+    def covers(self, labels) -> bool:
+        """Returns True if every column label has been read before, False if not."""
+
+        known_labels = set(self.labels)
+        return all(str(label) in known_labels for label in labels)
+
+class SchemaCache(object):
+    """
+    An on-disk store of the schemas of CSVs, keyed by their column labels. Instruments emit the same
+    layout in every CSV, so the schema learned from one of their CSVs is reused for the others.
+
+    Attributes
+    ----------
+    directory : str
+        Directory that holds the schemas
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def key(self, column_labels) -> str:
+        """Returns the key of the schema of a CSV, which is the hash of its header.
+
+        Parameters
+        ----------
+        column_labels : pd.Index
+            Column labels of the CSV, including the columns that are not read
+
+        Returns
+        -------
+        str
+            Hash of the column labels
+        """
+
+        header = json.dumps([SCHEMA_VERSION, [str(label) for label in column_labels]])
+        return hashlib.sha256(header.encode()).hexdigest()
+
+    def load(self, key) -> Schema or None:
+        """Returns the schema stored under the key, or None if there is none.
+
+        Parameters
+        ----------
+        key : str
+            Key returned by key()
+        """
+
+        try:
+            with open(self._path(key)) as schema_file:
+                stored = json.load(schema_file)
+            return Schema(stored['labels'], stored['datetime_formats'])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, key, schema) -> None:
+        """Stores a schema. The columns it does not hold are kept from the stored schema, so CSVs of
+        the same layout that are read with different columns share it.
+
+        Parameters
+        ----------
+        key : str
+            Key returned by key()
+        schema : Schema
+            Schema learned from a CSV
+        """
+
+        stored = self.load(key)
+        if (stored is not None):
+            read_labels = set(schema.labels)
+            stored.labels = [label for label in stored.labels if label not in read_labels] + schema.labels
+            stored.datetime_formats = {label: format for label, format in stored.datetime_formats.items() if label not in read_labels}
+            stored.datetime_formats.update(schema.datetime_formats)
+            schema = stored
+
+        # Write to a temporary file first so other processes never read a half written schema
+        path = self._path(key)
+        temp_path = path + '.' + str(os.getpid()) + '.tmp'
+        try:
+            os.makedirs(self.directory, exist_ok = True)
+            with open(temp_path, 'w') as schema_file:
+                json.dump({'labels': schema.labels, 'datetime_formats': schema.datetime_formats}, schema_file)
+            os.replace(temp_path, path)
+        except OSError:
+            if (os.path.isfile(temp_path)):
+                os.remove(temp_path)
+
+    def _path(self, key) -> str:
+        """Returns the file path of a schema."""
+
+        return os.path.join(self.directory, key + '.json')
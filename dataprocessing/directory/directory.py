@@ -12,25 +12,13 @@ class Directory(object):
     ----------
     directory_path: str
         File path of the directory
-    raw_data_file : str
-        Filename of raw data files 
-    excel_file : str
-       Filename of excel output file 
-    jpeg_file : str
-        Filename of jpeg output file  
-    pdf_file : str
-        Filename of pdf output file 
-    txt_file: str 
-        Filename of txt output file
+    file_srcs : list
+        File paths of the Excel version of the CSV file and of the output files  
     """ 
 
-    def __init__(self, output_name, raw_data_file, excel_file, jpeg_file, pdf_file, txt_file): 
+    def __init__(self, output_name, *file_names): 
         self.directory_path = os.path.join(os.getcwd(), output_name) 
-        self.raw_data_src = os.path.join(os.getcwd(), raw_data_file)
-        self.excel_src = os.path.join(os.getcwd(), excel_file)
-        self.jpeg_src = os.path.join(os.getcwd(), jpeg_file)
-        self.pdf_src = os.path.join(os.getcwd(), pdf_file)
-        self.txt_src = os.path.join(os.getcwd(), txt_file)
+        self.file_srcs = [os.path.join(os.getcwd(), file_name) for file_name in file_names]
 
     def create(self): 
         """Make directory and move files."""
@@ -57,32 +45,7 @@ class Directory(object):
         Helper function to _move_files(). 
         """
 
-        # Move Excel raw data file into directory 
-        shutil.move(self.raw_data_src, self.directory_path)
-
-        # Move Excel output file into directory, if it exists  
-        exists = os.path.isfile(self.excel_src)
-        if (exists): 
-            shutil.move(self.excel_src, self.directory_path)
-
-        # Move JPEG output file into directory, if it exists 
-        exists = os.path.isfile(self.jpeg_src)
-        if (exists): 
-            shutil.move(self.jpeg_src, self.directory_path)
-        
-        # Move PDF output file into directory, if it exists 
-        exists = os.path.isfile(self.pdf_src)
-        if (exists): 
-            shutil.move(self.pdf_src, self.directory_path)
-        
-        # Move txt output file into directory, if it exists
-        exists = os.path.isfile(self.txt_src)
-        if (exists): 
-            shutil.move(self.txt_src, self.directory_path)
-        
-
-    
-
-
-    
-
+        # Move every file into directory, if it exists. Only the files that were written are listed. 
+        for file_src in self.file_srcs: 
+            if (os.path.isfile(file_src)): 
+                shutil.move(file_src, self.directory_path)
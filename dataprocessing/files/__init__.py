@@ -1,2 +1,4 @@
+from .chart import Chart
 from .file import File
-from .file_types import ExcelFile, JPEGFile, PDFFile, TXTFile
+from .file_types import ExcelFile, JPEGFile, PNGFile, SVGFile, PDFFile, TXTFile, FeatherFile
+from .output_plan import OutputPlan
\ No newline at end of file
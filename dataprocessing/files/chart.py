@@ -0,0 +1,210 @@
+import threading
+import numpy as np
+import pandas as pd
+
+# Size of the chart in inches (US Letter), so it fills the first page of the PDF file
+FIGURE_SIZE = (8.5, 11)
+
+# Elapsed times are plotted as datetimes counted from this date, as matplotlib cannot plot timedeltas
+ELAPSED_EPOCH = '2000-01-01'
+SECONDS_PER_DAY = 86400
+
+# Space kept around the chart when it is cropped to its contents
+PAD_INCHES = 0.1
+
+class Chart(object):
+    """
+    The matplotlib chart of the processed CSV. It is drawn once per job and saved in any number of formats.
+
+    The figure is made without pyplot, so it holds no global state and is released like any other object.
+
+    Attributes
+    ----------
+    mapped_settings: MappedSettings
+        Contains the mapped settings in the configuration file, resolved against the processed CSV
+    general_settings: GeneralSettings
+        Contains the general settings of the configuration file
+    title : str
+        Title of the chart
+    x_values : pd.Series or np.ndarray
+        Values plotted on the x-axis. Elapsed times are already converted into a datetime64 array.
+    y_values : list
+        Values plotted on the y-axis, one per y-axis column, converted like x_values
+    figure : matplotlib.figure.Figure
+        The drawn chart
+    """
+
+    def __init__(self, mapped_settings, general_settings, output_data, title):
+        self.mapped_settings = mapped_settings
+        self.general_settings = general_settings
+        self.title = title
+        self.x_values = self._axis_values(output_data, mapped_settings.x_axis_index)
+        self.y_values = [self._axis_values(output_data, i) for i in mapped_settings.y_axis_indices]
+        self.figure = self._draw()
+        self._bbox = None
+        self._lock = threading.Lock()
+
+    def save(self, target, format) -> None:
+        """Saves the chart into a file or an in-memory buffer.
+
+        The chart is cropped to its contents. The crop is measured the first time the chart is saved
+        and reused afterwards, so every format only lays the chart out once.
+
+        Parameters
+        ----------
+        target : str or file object
+            File path or binary buffer the chart is saved into
+        format : str
+            Format of the saved chart, e.g. 'jpeg', 'png', 'svg' or 'pdf'
+        """
+
+        # A figure can only be rendered by one thread at a time
+        with self._lock:
+            if (self._bbox is None):
+                self._bbox = self.figure.get_tightbbox(self.figure.canvas.get_renderer()).padded(PAD_INCHES)
+            self.figure.savefig(target, format = format, bbox_inches = self._bbox)
+
+    def _axis_values(self, output_data, index) -> pd.Series or np.ndarray:
+        """Returns the values of a column plotted on the chart, without the empty cells.
+
+        As matplotlib does not allow timedelta objects to be directly set as an axis, elapsed times
+        are converted into datetime objects.
+
+        Helper function to __init__().
+        """
+
+        values = output_data[self.mapped_settings.titles[index]].dropna()
+        if (self.mapped_settings.columns[index].time_unit is not None):
+            values = self._convert_timedelta_to_datetime(values)
+        return values
+
+    def _convert_timedelta_to_datetime(self, timedelta_series) -> np.ndarray:
+        """
+        Converts a series of timedeltas into datetimes counted from ELAPSED_EPOCH, in one vectorized step.
+
+        Elapsed times of a day or more keep their days, and are labeled by the elapsed time formatter.
+
+        Parameters
+        ----------
+        timedelta_series: pd.Series
+            Contains timedelta objects
+
+        Returns
+        -------
+        np.ndarray
+            Contains datetime64 values
+        """
+
+        return np.datetime64(ELAPSED_EPOCH) + timedelta_series.to_numpy(dtype = 'timedelta64[ns]')
+
+    def _draw(self):
+        """Draws the chart into a new figure. matplotlib is only imported the first time a chart is drawn.
+
+        Helper function to __init__().
+        """
+
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from pandas.plotting import register_matplotlib_converters
+        register_matplotlib_converters()
+
+        new_titles = self.mapped_settings.titles
+        x_axis_index = self.mapped_settings.x_axis_index
+        y_axis_indices = self.mapped_settings.y_axis_indices
+
+        # Reminder: If there are multiple plots, their dtypes have to be the same!
+        fig = Figure(figsize = FIGURE_SIZE)
+        FigureCanvasAgg(fig)
+        ax = fig.subplots()
+
+        # Plot multiple graphs in a single chart.
+        for y_axis_index, y_axis in zip(y_axis_indices, self.y_values):
+            ax.plot(self.x_values, y_axis, label = new_titles[y_axis_index])
+
+        # Elapsed time formatting
+        if (self.mapped_settings.columns[x_axis_index].time_unit is not None):
+            self._format_x_date(fig, ax)
+
+        if (any(self.mapped_settings.columns[i].time_unit is not None for i in y_axis_indices)):
+            self._format_y_date(fig, ax)
+
+        # Set the x-label and the y-label/legend
+        self._chart_legend(ax, x_axis_index, y_axis_indices)
+
+        # Set the title
+        ax.set_title(self.title)
+
+        # Set gridlines
+        self._grid_lines(ax)
+
+        # Chart scaling
+        self._chart_scaling(ax)
+
+        # Set page number
+        fig.text(4.25/8.5, 0.5/11., '1', ha='center', fontsize=12)
+        return fig
+
+    def _chart_legend(self, ax, x_axis_index, y_axis_indices) -> None:
+        """Sets the chart legend. If there is only 1 plotted line, set the y-label."""
+
+        new_titles = self.mapped_settings.titles
+        ax.set_xlabel(new_titles[x_axis_index])
+        if (len(y_axis_indices) > 1):
+            ax.legend(loc='upper left', bbox_to_anchor =(1.05,1))
+        else:
+            ax.set_ylabel(new_titles[y_axis_indices[0]])
+
+    def _grid_lines(self, ax) -> None:
+        """Set the chart grid lines on or off."""
+
+        if (self.general_settings.grid_lines):
+            ax.grid(True)
+
+    def _format_x_date(self, fig, ax) -> None:
+        """Format a datetime x-axis so that the labels show the elapsed time, not the date"""
+
+        ax.xaxis.set_major_formatter(self._elapsed_time_formatter())
+
+        # Position the labels so they do not overlap with each other.
+        fig.autofmt_xdate()
+
+    def _format_y_date(self, fig, ax) -> None:
+        """Format a datetime y-axis so that the labels show the elapsed time, not the date."""
+
+        ax.yaxis.set_major_formatter(self._elapsed_time_formatter())
+
+    def _elapsed_time_formatter(self):
+        """Returns a tick formatter that labels datetimes counted from ELAPSED_EPOCH as elapsed times in
+        %H:%M:%S format. Hours keep counting past a day, like in the PDF and text files.
+        """
+
+        import matplotlib.dates as mdates
+        from matplotlib.ticker import FuncFormatter
+
+        epoch = mdates.date2num(np.datetime64(ELAPSED_EPOCH))
+
+        def format_elapsed_time(value, position = None):
+            seconds = int(round((value - epoch) * SECONDS_PER_DAY))
+            sign = '-' if seconds < 0 else ''
+            hours, seconds = divmod(abs(seconds), 3600)
+            minutes, seconds = divmod(seconds, 60)
+            return '{}{:02d}:{:02d}:{:02d}'.format(sign, hours, minutes, seconds)
+
+        return FuncFormatter(format_elapsed_time)
+
+    def _chart_scaling(self, ax) -> None:
+        """Set the scales on the x and y axis"""
+
+        x_min = self.general_settings.x_min
+        x_max = self.general_settings.x_max
+        y_min = self.general_settings.y_min
+        y_max = self.general_settings.y_max
+
+        if (x_min is not None):
+            ax.set_xlim(left = x_min)
+        if (x_max is not None):
+            ax.set_xlim(right = x_max)
+        if (y_min is not None):
+            ax.set_ylim(bottom = y_min)
+        if (y_max is not None):
+            ax.set_ylim(top = y_max)
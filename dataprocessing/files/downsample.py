@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+def min_max_positions(columns, points) -> np.ndarray:
+    """Returns the positions of the rows a chart is drawn with so it holds about 'points' points.
+
+    The rows are split into buckets of consecutive rows, and every bucket keeps the rows holding the
+    minimum and the maximum of every column (the min/max envelope). Peaks stay on the chart however
+    few points are kept. The rows kept are shared by every column, so the columns keep being
+    plotted against the same x-axis values. The first and last rows are always kept.
+
+    Parameters
+    ----------
+    columns : list
+        pd.Series of every column plotted on the y-axis, all of the same length
+    points : int
+        Number of points every column is drawn with, at most
+
+    Returns
+    -------
+    np.ndarray
+        Positions of the rows kept, in order. Every position if there are no more rows than points.
+    """
+
+    total_rows = len(columns[0])
+    if (total_rows <= points):
+        return np.arange(total_rows)
+
+    # Every bucket keeps up to two rows per column
+    buckets = max(1, points // (2 * len(columns)))
+    bucket_rows = -(-total_rows // buckets)
+    buckets = -(-total_rows // bucket_rows)
+    offsets = np.arange(buckets) * bucket_rows
+
+    positions = [np.array([0, total_rows - 1])]
+    for column in columns:
+        values = _float_values(column)
+
+        # Pad the last bucket with values that are never the minimum or the maximum
+        padding = buckets * bucket_rows - total_rows
+        for fill, find in ((np.inf, np.argmin), (-np.inf, np.argmax)):
+            padded = np.concatenate([np.where(np.isnan(values), fill, values), np.full(padding, fill)])
+            positions.append(offsets + find(padded.reshape(buckets, bucket_rows), axis = 1))
+    return np.unique(np.concatenate(positions))
+
+def _float_values(column) -> np.ndarray:
+    """Returns the values of a column as floats, with NaN for empty cells. Elapsed times are in seconds.
+
+    Helper function to min_max_positions().
+    """
+
+    if (pd.api.types.is_timedelta64_dtype(column)):
+        return column.dt.total_seconds().to_numpy()
+    return pd.to_numeric(column, errors = 'coerce').to_numpy(dtype = float)
@@ -1,4 +1,4 @@
-import pandas as pd
+from .output_plan import OutputPlan
 
 class File(object): 
     """
@@ -6,38 +6,27 @@ class File(object):
 
     Attributes
     ---------- 
-    mapped_settings: MappedExcelDataFrame 
-        Contains the mapped settings in the configuration file
-    general_settings: ExcelDataFrame
+    mapped_settings: MappedSettings 
+        Contains the mapped settings in the configuration file, resolved against the processed CSV
+    general_settings: GeneralSettings
         Contains the general settings of the configuration file  
     output_data: pd.DataFrame 
         Dataframe of the processed CSV 
     output_name: str 
         Name of the output files 
+    plan: OutputPlan
+        Decides which output files are generated and holds the intermediate results they share. 
+        A plan of its own is made if None is given. 
     """
 
-    def __init__(self, mapped_settings, general_settings, output_data, output_name): 
+    def __init__(self, mapped_settings, general_settings, output_data, output_name, plan = None): 
         self.mapped_settings = mapped_settings
         self.general_settings = general_settings
         self.output_data = output_data
         self.output_name = output_name
-    
-    def make_file(self, choice) -> None: 
-        """ Determines if an Excel, JPEG, or PDF file will be generated"""
-
-        if (pd.isnull(choice) or choice.upper() == 'YES'): 
-            return True
-        return False
-    
-    def get_str_timedelta(self): 
-        """Convert timedelta objects into str representations."""
-
-        new_df = self.output_data.fillna(' ')
-        indices = self.mapped_settings.get_column('Time Unit').dropna().index
-        for i in indices: 
-            label = self.mapped_settings.get_column('Title').loc[i]
-            new_df[label] = [time[7:15] for time in new_df[label].astype(str)]
-        return new_df
+        if (plan is None): 
+            plan = OutputPlan(mapped_settings, general_settings, output_data)
+        self.plan = plan
 
 class ChartFile(File): 
     """
@@ -47,51 +36,31 @@ class ChartFile(File):
     def make_chart(self) -> bool:
         """Returns True if a chart will be generated, False if not.""" 
 
-        axis = self.mapped_settings.get_column('Axis')
-        if (axis.dropna().empty or not ((axis == 'x').any() or (axis == 'X').any()) or not ((axis == 'y').any() or (axis == 'Y').any())):  
-            return False
-        return True
+        return self.plan.chart
  
-    #TODO: Determine if get_x_axis() and get_y_axis() return the indices only? 
-    def get_x_axis(self) -> pd.Series: 
+    def get_x_axis(self) -> int or None: 
         """
-        Returns a series of length 1 that contains the row index of the 
-        x-axis column label in the configuration file mapped_settings. 
+        Returns the index of the x-axis column in the mapped settings, or None if there is no chart. 
         """
         
-        x_axis = None
-        if (self.make_chart()): 
-            axis = self.mapped_settings.get_column('Axis')
-            x_axis = axis.loc[(axis == 'x') | (axis == 'X')]
-        return x_axis
+        return self.mapped_settings.x_axis_index
     
-    def get_y_axis(self) -> pd.Series: 
+    def get_y_axis(self) -> tuple: 
         """
-        Returns a series that contains the row indices of the
-        y-axis column labels in the configuration file mapped_settings. 
+        Returns the indices of the y-axis columns in the mapped settings, which is empty if there is no chart. 
         """ 
         
-        y_axis = None
-        if (self.make_chart()): 
-            axis = self.mapped_settings.get_column('Axis')
-            y_axis = axis.loc[(axis == 'y') | (axis == 'Y')]
-        return y_axis        
+        return self.mapped_settings.y_axis_indices
     
-    def get_chart_title(self, new_titles, chart_title, x_axis_index, y_axis_indices):
+    def get_chart(self):
+        """Returns the matplotlib chart of the processed CSV. It is drawn the first time an output file asks for it."""
+
+        return self.plan.get_chart(self.get_chart_title())
+
+    def get_chart_title(self) -> str:
         """Determines the chart title. 
 
         If no title is given, then the chart title will default to the format '[All] y-axis vs x-axis.'
-        
-        Parameters
-        ---------- 
-        new_titles : series 
-            New titles of the processed CSV columns 
-        chart_title : series
-            Contains a manually given chart title or NaN
-        x_axis_row : series 
-            Row index of the x-axis column label in the configuration file
-        y_axis_row : series 
-            Row indices of the y-axis column labels in the configuration file
 
         Returns
         -------
@@ -99,14 +68,29 @@ class ChartFile(File):
             Title of the chart  
         """
         
-        # Note: A column with 'NaNs' is not considered empty
-        if (chart_title.dropna().empty): 
-            title = ''
-            for i in range(y_axis_indices.size-1): 
-                title += new_titles.loc[y_axis_indices[i]] + ", "
-            title += new_titles.loc[y_axis_indices[y_axis_indices.size-1]] + " vs " + new_titles.loc[x_axis_index]
-        else: 
-            title = chart_title.loc[0]
-        return title
+        if (self.general_settings.chart_title is None): 
+            new_titles = self.mapped_settings.titles
+            y_titles = [str(new_titles[i]) for i in self.get_y_axis()]
+            return ', '.join(y_titles) + ' vs ' + str(new_titles[self.get_x_axis()])
+        return self.general_settings.chart_title
+
+class ImageFile(ChartFile): 
+    """
+    Extends ChartFile to output an image of the chart. Subclasses set the image format. 
+
+    Attributes
+    ----------
+    extension : str
+        File extension of the image, which is also the format matplotlib saves it in
+    """
+
+    extension = None
+
+    def get_name(self): 
+        return self.output_name + '.' + self.extension
 
+    def output(self) -> None: 
+        """Outputs an image file."""
 
+        if (self.will_output_file()): 
+            self.get_chart().save(self.get_name(), self.extension)
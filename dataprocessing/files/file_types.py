@@ -1,17 +1,34 @@
-from datetime import (datetime, time)
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from matplotlib.backends.backend_pdf import PdfPages
 import numpy as np
 import pandas as pd
-from pandas.plotting import register_matplotlib_converters
-register_matplotlib_converters()
+import io
 import os
+import gzip
+import locale
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font
 from openpyxl.chart import (ScatterChart, Reference, Series)
-from PyPDF2 import PdfFileReader, PdfFileWriter
-from .file import (File, ChartFile)
+from .file import (File, ChartFile, ImageFile)
+from .pdf_table import (PDFTableWriter, ROWS_PER_PAGE)
+from . import txt_format
+
+# Rows of the processed CSV written into the Excel file at a time 
+WRITE_CHUNK_ROWS = 10000
+
+# Pages of the PDF table whose rows are converted into text at a time 
+PDF_BLOCK_PAGES = 100
+
+# Rows of the processed CSV converted into text and written into the text file at a time 
+TXT_CHUNK_ROWS = 100000
+
+# Encoding of the text file. Like np.savetxt, which wrote it before, it is the encoding of the system. 
+TXT_ENCODING = locale.getpreferredencoding(False)
+
+# Compression level of gzipped text files. Higher levels take several times longer for little gain. 
+TXT_GZIP_LEVEL = 1
+
+# Compression of the Feather file. zstd decompresses faster than the file can be read from disk. 
+FEATHER_COMPRESSION = 'zstd'
 
 class ExcelFile(ChartFile):
     """
@@ -22,9 +39,7 @@ class ExcelFile(ChartFile):
         return self.output_name + '.xlsx'
 
     def will_output_file(self): 
-        if (self.make_file(self.general_settings.get_column('Excel').loc[0])): 
-            return True 
-        return False 
+        return self.plan.excel
     
     def output(self) -> None:
         """ Outputs an Excel file"""
@@ -34,108 +49,126 @@ class ExcelFile(ChartFile):
             # Create workbook to hold output data 
             wb = self._create_plotted_workbook()
 
-            self._process_data(wb)
+            self._process_data(wb.worksheets[0], self.output_data)
 
             if (self.make_chart()): 
-               self._create_chart(wb)
+               self._create_chart(wb, *self._chart_data_sheet(wb))
             
             wb.save(self.get_name())
             
     def _create_plotted_workbook(self) -> Workbook: 
-        """Returns an empty Excel workbook that will later hold the processed CSV data.
+        """Returns a write-only Excel workbook with an empty worksheet that will later hold the processed CSV data.
         
         Helper function to output(). 
         """
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = 'Output Data'
+        wb = Workbook(write_only = True)
+        wb.create_sheet('Output Data')
         return wb
     
-    def _process_data(self, wb):
-        """Map the input data into the specified columns in the Excel workbook.   
+    def _process_data(self, ws, output_data):
+        """Map the input data into the specified columns in the Excel worksheet.   
+
+        The worksheet is written row by row in a single pass over the columns of the processed data. 
         
-        Helper function to output(). 
+        Helper function to output() and _chart_data_sheet(). 
 
         Parameters
         ----------
-        wb : Workbook 
-            Empty workbook to store input data 
+        ws : Worksheet 
+            Empty worksheet to store input data 
+        output_data : pd.DataFrame
+            Rows of the processed CSV written into the worksheet
 
         Returns
         ------- 
-        Workbook
+        Worksheet
             Filled with extracted CSV data 
         """
         
-        new_titles = new_titles = self.mapped_settings.get_column('Title')
-        output_numbers = self.mapped_settings.get_column('Output')
-
-        # Grab active Worksheet
-        ws = wb.active
-
-        # Write in all the data from the extracted CSV columns  
-        for j in range(output_numbers.size): 
-            self._write_in_values(ws, new_titles.iloc[j], output_numbers.iloc[j])
-        return wb
-    
+        new_titles = self.mapped_settings.titles
+        output_numbers = self.mapped_settings.output_column_numbers
+        width = max(output_numbers)
+        total_rows = output_data.shape[0]
+
+        # Write in the column titles 
+        header = [None] * width
+        for j in range(len(output_numbers)): 
+            cell = WriteOnlyCell(ws, value = new_titles[j])
+            cell.font = Font(bold = True)
+            header[output_numbers[j] - 1] = cell
+        ws.append(header)
+
+        # Write in all the data from the extracted CSV columns, a block of rows at a time   
+        columns = [self._column_values(output_data, new_titles[j]) for j in range(len(output_numbers))]
+        for start in range(0, total_rows, WRITE_CHUNK_ROWS): 
+            stop = min(start + WRITE_CHUNK_ROWS, total_rows)
+            block = np.full((stop - start, width), None, dtype = object)
+            for j in range(len(output_numbers)): 
+                block[:, output_numbers[j] - 1] = columns[j][start:stop]
+            for row in block.tolist(): 
+                ws.append(row)
+        return ws
     
-    def _write_in_values(self, ws, label, col_num):
-        """Writes the data of a CSV column into an Excel worksheet. 
+    def _column_values(self, output_data, label) -> np.ndarray:
+        """Returns the data of a processed CSV column as values that can be written into Excel. Empty cells are None. 
 
         Helper function to _process_data(). 
 
         Parameters
         ----------
-        ws : Worksheet
-            Worksheet that CSV column is writing into 
+        output_data : pd.DataFrame
+            Rows of the processed CSV 
         label : str
-            Column labels of the CSV columns in the new worksheet      
-        col_num : int
-            Column number the input data is being written into in the new worksheet   
+            Column label of the processed CSV column 
 
         Returns
         ------ 
-        None 
+        np.ndarray 
+            Contains the values of the column  
         """ 
 
-        header = ws.cell(row=1, column = col_num) 
-        header.value = label
-        header.font = Font(bold=True)
-        #col_index = title_input
-        
-       
-        # Indices: i retrieves the data in the column 
-        #          cellRow ensures that the data is being mapped to the current cell in the Excel worksheet
-        cellRow = 2 
-        i = 0
-
-        # Determine the size of the current column 
-        size = self.output_data[label].size
-
-        while (i < size):   
-            ws.cell(row = cellRow, column = col_num).value = self.output_data.loc[i,label]
-            cellRow += 1
-            i += 1
+        column = output_data[label]
+        if (pd.api.types.is_timedelta64_dtype(column)): 
+            values = column.dt.to_pytimedelta()
+        else: 
+            values = column.to_numpy(dtype = object)
+        values[column.isnull().to_numpy()] = None
+        return values
     
-    def _create_chart(self,wb): 
+    def _chart_data_sheet(self, wb) -> tuple: 
+        """Returns the worksheet the chart is drawn from and its number of rows of data. 
+
+        If the 'Excel Chart Points' general setting is given and the processed CSV is longer, its rows are 
+        decimated like the matplotlib chart and written into a separate 'Chart Data' worksheet, so Excel 
+        stays responsive. The full data stays on 'Output Data'. 
+
+        Helper function to output(). 
+        """
+
+        chart_data = self.plan.decimate(self.general_settings.excel_chart_points)
+        if (chart_data is self.output_data): 
+            return wb.worksheets[0], chart_data.shape[0]
+        ws = wb.create_sheet('Chart Data')
+        self._process_data(ws, chart_data)
+        return ws, chart_data.shape[0]
+
+    def _create_chart(self, wb, ws, row_size): 
         """Creates a chart sheet of the processed CSV data in the Excel workbook. 
 
         Parameters
         ----------
         wb (workbook): Excel workbook of the mapped data 
+        ws (worksheet): Worksheet the chart is drawn from 
+        row_size (int): Number of rows of data on the worksheet 
 
         Returns 
         -------
         None 
         """
 
-        ws = wb.active
-        
-        outputs = self.mapped_settings.get_column('Output')  
-        new_titles = self.mapped_settings.get_column('Title')
-        chart_title = self.general_settings.get_column('Chart Title')
-        row_size = self.output_data[new_titles.loc[0]].size # Get the row number of the last cell 
+        outputs = self.mapped_settings.output_column_numbers
+        new_titles = self.mapped_settings.titles
         
         # Create a ScatterChart chart sheet 
         cs = wb.create_chartsheet()
@@ -143,29 +176,29 @@ class ExcelFile(ChartFile):
 
         # Store the row indices of the x-axis and y-axis column labels in the configuration 
         # file mapped_settings.  
-        x_axis_index= self.get_x_axis().index[0] 
-        y_axis_indices = self.get_y_axis().index
+        x_axis_index = self.get_x_axis()
+        y_axis_indices = self.get_y_axis()
 
-        # Set x-axis 
-        x = Reference(ws, min_col=outputs.loc[x_axis_index], min_row = 2, max_row = row_size)
+        # Set x-axis. The data starts below the column titles, so the last row is row_size + 1. 
+        x = Reference(ws, min_col=outputs[x_axis_index], min_row = 2, max_row = row_size + 1)
                
         # Plot multiple graphs in a single chart  
         for row in y_axis_indices: 
-            y = Reference(ws, min_col = outputs.loc[row], min_row = 2, max_row = row_size)
-            s = Series(y,x,title=new_titles.loc[row])
+            y = Reference(ws, min_col = outputs[row], min_row = 2, max_row = row_size + 1)
+            s = Series(y,x,title=new_titles[row])
             chart.append(s)
         
         # Set the x-axis label
-        chart.x_axis.title = new_titles.loc[x_axis_index]
+        chart.x_axis.title = new_titles[x_axis_index]
         
         # Situate x-axis below negative numbers 
         chart.x_axis.tickLblPos = "low"
 
         # Create the chart legend or set the y-axis label 
-        self._chart_legend(chart, new_titles.loc[y_axis_indices[0]], y_axis_indices) 
+        self._chart_legend(chart, new_titles[y_axis_indices[0]], y_axis_indices) 
     
         # Title the chart
-        chart.title = self.get_chart_title(new_titles, chart_title, x_axis_index, y_axis_indices)
+        chart.title = self.get_chart_title()
 
         # Set grid lines on or off. 
         self._grid_lines(chart)
@@ -189,213 +222,56 @@ class ExcelFile(ChartFile):
     def _grid_lines(self, chart) -> None: 
         """Set the chart grid lines on or off."""
         
-        isGridLinesOn = self.general_settings.get_column('Grid Lines').loc[0]
-        if (not pd.isnull(isGridLinesOn) and isGridLinesOn.upper() == 'NO'): 
+        if (not self.general_settings.grid_lines): 
             chart.x_axis.majorGridlines = None 
             chart.y_axis.majorGridlines = None
     
     def _chart_scaling(self,chart) -> None: 
         """Set the scales on the x and y axis"""
         
-        x_min = self.general_settings.get_column('X Min').loc[0]
-        x_max = self.general_settings.get_column('X Max').loc[0]
-        y_min = self.general_settings.get_column('Y Min').loc[0]
-        y_max = self.general_settings.get_column('Y Max').loc[0]
+        x_min = self.general_settings.x_min
+        x_max = self.general_settings.x_max
+        y_min = self.general_settings.y_min
+        y_max = self.general_settings.y_max
 
-        if (not pd.isnull(x_min)): 
+        if (x_min is not None): 
             chart.x_axis.scaling.min = x_min 
-        if (not pd.isnull(x_max)): 
+        if (x_max is not None): 
             chart.x_axis.scaling.max = x_max
-        if (not pd.isnull(y_min)): 
+        if (y_min is not None): 
             chart.y_axis.scaling.min = y_min 
-        if (not pd.isnull(y_max)): 
+        if (y_max is not None): 
             chart.y_axis.scaling.max = y_max
 
-class JPEGFile(ChartFile): 
+class JPEGFile(ImageFile): 
     """
-    Extends ChartFile to output a JPEG file fo the processed CSV results.
+    Extends ImageFile to output a JPEG file of the chart of the processed CSV results.
     """
 
-    def get_name(self): 
-        return self.output_name + '.jpeg'
-    
-    def will_output_file(self): 
-        if (self.make_file(self.general_settings.get_column('JPEG').loc[0]) 
-            and self.make_chart()): 
-            return True 
-        return False 
-
-    def output(self) -> None: 
-        """Outputs an JPEG file."""
-
-        jpeg_choice = self.make_file(self.general_settings.get_column('JPEG').loc[0])
-        pdf_choice = self.make_file(self.general_settings.get_column('PDF').loc[0])
-        if ((jpeg_choice or pdf_choice) and self.make_chart()):
-            self._make(jpeg_choice, pdf_choice) 
-    
-    def _make(self, jpeg_choice, pdf_choice):  
-        """Produces a JPG and/or PDF file of a matplotlib chart. 
-        
-        Helper function to output(). 
-
-        Parameters
-        ----------
-        jpeg_choice : bool 
-            True if chart will be saved as JPEG, False otherwise
-        pdf_choice : bool
-            True if chart will be saved as PDF, False otherwise
+    extension = 'jpeg'
 
-        Returns 
-        -------
-        None
-        """
-        
-        new_titles = self.mapped_settings.get_column('Title')
-        chart_title = self.general_settings.get_column('Chart Title')
-        x_axis_index = self.get_x_axis().index[0]
-        y_axis_indices = self.get_y_axis().index
-        is_x_elapsed_time = False
-        is_y_elapsed_time = False
-
-        # As matplotlib does not allow timedelta objects to be directly set as an axis, we need to convert 
-        # the timedelta objects into datetime objects to plot them on a chart.
-        x_axis = self.output_data[new_titles[x_axis_index]].dropna() 
-        if (not (pd.isnull(self.mapped_settings.get_column('Time Unit').loc[x_axis_index]))):
-            is_x_elapsed_time = True
-            x_axis = pd.Series(self._convert_timedelta_to_datetime(x_axis))
-            
-        
-        # Reminder: If there are multiple plots, their dtypes have to be the same! 
-        fig = plt.figure(figsize = (8.5, 11))
-        ax = plt.subplot()
-
-        # Plot multiple graphs in a single chart. 
-        for y_axis_index in y_axis_indices: 
-            y_axis_title = new_titles[y_axis_index]
-            y_axis = self.output_data[y_axis_title].dropna()
-            if (not pd.isnull(self.mapped_settings.get_column('Time Unit').loc[y_axis_index])): 
-                is_y_elapsed_time = True
-                y_axis = pd.Series(self._convert_timedelta_to_datetime(y_axis))
-            ax.plot(x_axis, y_axis, label = new_titles.iloc[y_axis_index])
-       
-        
-        # Elapsed time formatting
-        if (is_x_elapsed_time): 
-            self._format_x_date(fig, ax)
-        
-        if (is_y_elapsed_time): 
-            self._format_y_date(fig, ax)
-        
-        # Set the x-label and the y-label/legend
-        self._chart_legend(ax, x_axis_index, y_axis_indices)
-        
-        # Set the title 
-        title = self.get_chart_title(new_titles, chart_title, x_axis_index, y_axis_indices)
-        ax.set_title(title)
-        
-        # Set gridlines 
-        self._grid_lines(ax)   
-
-        # Chart scaling 
-        self._chart_scaling(ax)
-        
-        # Set page number 
-        fig.text(4.25/8.5, 0.5/11., '1', ha='center', fontsize=12)
-
-        # Save charts in stated formats
-        if (jpeg_choice): 
-            plt.savefig(self.get_name(), bbox_inches = 'tight')
-        
-        if (pdf_choice): 
-            plt.savefig(self.output_name + '_chart' + '.pdf', bbox_inches = 'tight') 
-    
-        
-
-    #TODO: Faster way to acomplish this https://stackoverflow.com/questions/48294332/plot-datetime-timedelta-using-matplotlib-and-python
-    def _convert_timedelta_to_datetime(self,timedelta_series): 
-        """
-        Converts a series with timedelta objects into a series with datetime objects. 
-
-        Parameters 
-        ----------
-        timedelta_series: pd.Series
-            Contains timedelta objects
-
-        Returns
-        -------
-        pd.Series
-            Contains datetime objects 
-        """
-        
-        # Convert 'timedelta_series' to type str 
-        timedelta_str_series = timedelta_series.astype(str)
-
-        # Split 'timedelta_str_series' using the space delimiter and store the results into a list
-        timedelta_str_list = [time.split() for time in timedelta_str_series]
-        
-        # Retrieve the 'time' portion of 'timedelta_str_list' and store into another list  
-        time_str_list = [time[2] for time in timedelta_str_list]
-    
-        # Split 'time_str_list' using '.' delimiter and store results back into 'time_str_list'  
-        time_str_list = [time.split('.') for time in time_str_list]
-
-        # Retrieve the '%H:%M:%S' formatted time and store results back into list 
-        time_str_list = [time[0] for time in time_str_list]
-
-        # Convert 'time_str_list' into a series and turn each element into a datetime object. 
-        # Store in a new list. 
-        time_str_series = pd.Series(time_str_list)
-        time_obj = [datetime.strptime(time_str, '%H:%M:%S').time() for time_str in time_str_series]
-        x_axis = [ datetime.combine(datetime.now(), time) for time in time_obj]
-        
-        return x_axis
+    def will_output_file(self): 
+        return self.plan.jpeg
 
-    def _chart_legend(self, ax, x_axis_index, y_axis_indices) -> None: 
-        """Sets the chart legend. If there is only 1 plotted line, set the y-label."""
-        
-        new_titles = self.mapped_settings.get_column('Title') 
-        ax.set_xlabel(new_titles[x_axis_index])
-        if (len(y_axis_indices) > 1):
-            ax.legend(loc='upper left', bbox_to_anchor =(1.05,1))
-        else: 
-            ax.set_ylabel(new_titles[y_axis_indices[0]])
+class PNGFile(ImageFile): 
+    """
+    Extends ImageFile to output a PNG file of the chart of the processed CSV results.
+    """
 
-    def _grid_lines(self, ax) -> None: 
-        """Set the chart grid lines on or off."""
+    extension = 'png'
 
-        isGridLinesOn = self.general_settings.get_column('Grid Lines') 
-        if (pd.isnull(isGridLinesOn.loc[0]) or isGridLinesOn.loc[0].upper() == 'YES'): 
-            ax.grid(b = True)
-    
-    def _format_x_date(self, fig, ax) -> None: 
-        """Format a datetime x-axis so that the labels do not show the day, only the time"""
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
+    def will_output_file(self): 
+        return self.plan.png
 
-        # Position the labels so they do not overlap with each other. 
-        fig.autofmt_xdate()
-    
-    def _format_y_date(self, fig, ax) -> None: 
-        """Format a datetime y-axis so that the labels do not show the day, only the time."""
+class SVGFile(ImageFile): 
+    """
+    Extends ImageFile to output an SVG file of the chart of the processed CSV results.
+    """
 
-        ax.yaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
-    
-    def _chart_scaling(self, ax) -> None: 
-        """Set the scales on the x and y axis"""
+    extension = 'svg'
 
-        x_min = self.general_settings.get_column('X Min').loc[0]
-        x_max = self.general_settings.get_column('X Max').loc[0]
-        y_min = self.general_settings.get_column('Y Min').loc[0]
-        y_max = self.general_settings.get_column('Y Max').loc[0]
-
-        if (not pd.isnull(x_min)): 
-            ax.set_xlim(left = x_min)
-        if (not pd.isnull(x_max)): 
-            ax.set_xlim(right = x_max)
-        if (not pd.isnull(y_min)): 
-            ax.set_ylim(bottom = y_min)
-        if (not pd.isnull(y_max)): 
-            ax.set_ylim(top = y_max)
-        
+    def will_output_file(self): 
+        return self.plan.svg
 
 class PDFFile (ChartFile): 
     """
@@ -406,9 +282,7 @@ class PDFFile (ChartFile):
         return self.output_name + '.pdf'
 
     def will_output_file(self): 
-        if (self.make_file(self.general_settings.get_column('PDF').loc[0])): 
-            return True
-        return False 
+        return self.plan.pdf
 
     def output(self) -> None: 
         """Outputs a PDF file."""
@@ -422,120 +296,94 @@ class PDFFile (ChartFile):
         Helper function to output(). 
         """
         
-        # Grab the file path of the 
-        df_file = os.getcwd() + '\\' + self.output_name + '.pdf'
-        
         # Replace NaN values with empty strings so the empty data cells do not 
         # look like they hold any values in the PDF file. 
         # Convert datetime into strings so 0 days portion doesn't show up in PDF
-        mapping_df = self.get_str_timedelta()
-
-        # Output the table in a PDF. 
-        self._make_table(mapping_df)
-        
-        # If the PDF file is to contain a chart, then merge the dataframe and chart PDF into a single PDF. 
-        if (self.make_chart()):   
-            df_file = os.getcwd() + '\\' + self.output_name + '_table.pdf'
-            #pdfkit.from_string(mapping_df.to_html(), df_file)
-            paths = [os.getcwd() + '\\' + self.output_name + '_chart.pdf' ,df_file]
-            self._merge_pdfs(paths)
-
-    # def timedelta_to_string(self,mapping_df): 
-        
-    #     indices = self.mapped_settings.get_column('Time Unit').dropna().index
-    #     for i in indices: 
-    #         label = self.mapped_settings.get_column('Title').loc[i]
-    #         mapping_df[label] = [time[7:15] for time in mapping_df[label].astype(str)]
-    #     return mapping_df
-
-    def _make_table(self, mapping_df): 
+        # Huge outputs are cut down to the rows chosen by the table policy. 
+        mapping_df = self.plan.get_table_data()
+
+        # Without a chart, the table is written straight into the PDF file. 
+        if (not self.plan.chart_pdf): 
+            with open(self.get_name(), 'wb') as stream: 
+                self._make_table(mapping_df, stream, 1)
+            return
+
+        # Otherwise the chart and the table are made in memory and merged into the PDF file, 
+        # with the chart as the first page. 
+        chart_stream = io.BytesIO()
+        self.get_chart().save(chart_stream, 'pdf')
+        table_stream = io.BytesIO()
+        self._make_table(mapping_df, table_stream, 2)
+        self._merge_pdfs([chart_stream, table_stream])
+
+    def _make_table(self, mapping_df, stream, page_number): 
         """
-        Renders the output dataframe in PDF format. 
+        Writes the output dataframe into a PDF as a table, ROWS_PER_PAGE rows at a time. 
 
-        Source: https://stackoverflow.com/questions/19726663/how-to-save-the-pandas-dataframe-series-data-as-a-figure
-
-        Parameters: 
-        mapping_df (pd.DataFrame): Output dataframe with NaNs replaced with whitespace
+        Parameters
+        ----------
+        mapping_df : pd.DataFrame
+            Output dataframe with NaNs replaced with whitespace
+        stream : file object
+            Binary file or in-memory buffer the PDF is written into
+        page_number : int
+            Page number of the first page of the table
 
-        Returns: 
+        Returns
+        ------- 
         None 
         """
 
-        if (self.make_chart()): 
-            pp = PdfPages(self.output_name + '_table.pdf')
-        else: 
-            pp = PdfPages(self.get_name())
-        total_rows, total_cols = mapping_df.shape
+        # Like the matplotlib tables it replaces, the rows are labeled with their index 
+        table_df = mapping_df.reset_index()
+        table_df.columns = [''] + list(mapping_df.columns)
+        total_rows = table_df.shape[0]
 
-        rows_per_page = 40 # Assign a page cut off length
-        rows_printed = 0
+        # The rows are converted into text a block of pages at a time 
+        block_rows = ROWS_PER_PAGE * PDF_BLOCK_PAGES
+        writer = PDFTableWriter(stream, table_df.columns, self._column_chars(table_df), 'Table', page_number)
+        for block_start in range(0, max(total_rows, 1), block_rows): 
+            rows = table_df.iloc[block_start:block_start + block_rows].astype(str).values.tolist()
+            for start in range(0, max(len(rows), 1), ROWS_PER_PAGE): 
+                writer.add_page(rows[start:start + ROWS_PER_PAGE])
+        writer.close()
 
-        if (self.make_chart()): 
-            page_number = 2
-        else: 
-            page_number = 1
+    def _column_chars(self, table_df) -> list: 
+        """Returns the length of the longest text in every column, to size the columns of the PDF table. 
 
-        while (total_rows >0): 
+        Helper function to _make_table(). 
+        """
 
-            # Put the table on a correctly sized figure    
-            fig = plt.figure(figsize=(8.5,11))
-            ax = plt.subplot()
-            ax.axis('off')
-            
-            #try: 
-             #   matplotlib_tab = pd.plotting.table(ax, mapping_df.iloc[rows_printed:rows_printed+rows_per_page], loc='upper center', colWidths=[0.2, 0.2, 0.2])    
-            #except IndexError:
-            matplotlib_tab = pd.plotting.table(ax, mapping_df.iloc[rows_printed:rows_printed+rows_per_page], loc='upper center')
-
-            # Style the cells  
-            table_props=matplotlib_tab.properties()
-            table_cells=table_props['child_artists'] # I have no clue why child_artists works
-            for cell in table_cells:
-                    cell.set_height(0.024)
-                    cell.set_fontsize(14)
-                    
-            # Add a header and footer with page number 
-            fig.text(4.25/8.5, 10.5/11., "Table", ha='center', fontsize=12)
-            fig.text(4.25/8.5, 0.5/11., str(page_number), ha='center', fontsize=12)
-
-            pp.savefig()
-            plt.close()
-
-            #Update variables
-            rows_printed += rows_per_page
-            total_rows -= rows_per_page
-            page_number+=1
-
-        pp.close()
-
-
-    def _merge_pdfs(self,paths): 
-        """Merges two PDFs into a single PDF 
+        if (table_df.empty): 
+            return [0] * table_df.shape[1]
+        return [table_df.iloc[:, j].astype(str).str.len().max() for j in range(table_df.shape[1])]
+
+    def _merge_pdfs(self, streams): 
+        """Merges PDFs held in memory into the PDF file 
         
         Source: https://realpython.com/pdf-python/
 
         Parameters
         ---------- 
-        paths : list
-            File paths of the PDFs to be merged  
+        streams : list
+            In-memory buffers of the PDFs to be merged, in page order  
 
         Returns 
         --------
         None    
         """
         
+        from PyPDF2 import PdfFileReader, PdfFileWriter
+
         pdf_writer = PdfFileWriter()
-        for path in paths: 
-            pdf_reader = PdfFileReader(path)
+        for stream in streams: 
+            stream.seek(0)
+            pdf_reader = PdfFileReader(stream)
             for page in range(pdf_reader.getNumPages()):
                 pdf_writer.addPage(pdf_reader.getPage(page))
         
         with open(self.get_name(), 'wb') as out: 
             pdf_writer.write(out)
-        
-        # Delete merged files 
-        os.remove(paths[0])
-        os.remove(paths[1])
 
 class TXTFile(File): 
     """
@@ -543,12 +391,12 @@ class TXTFile(File):
     """
 
     def get_name(self): 
+        if (self.general_settings.txt_gzip): 
+            return self.output_name + '.txt.gz'
         return self.output_name + '.txt'
 
     def will_output_file(self): 
-        if (self.make_file(self.general_settings.get_column('TXT').loc[0])):
-            return True
-        return False 
+        return self.plan.txt
 
     def output(self): 
         """Outputs a text file."""
@@ -559,29 +407,58 @@ class TXTFile(File):
     def _make(self) -> None: 
         """Generates a text file of the processed results. 
 
-        Helper function to output(). Converts the DataFrame into a NumPy array 
-        and uses Numpy functionality to save the array as a text file. 
+        Helper function to output(). The rows are written TXT_CHUNK_ROWS at a time. Every column of 
+        a chunk is converted into text at once with NumPy, and the chunk is joined into lines and 
+        written in a single call. 
+        """
+
+        delimiter = self.general_settings.txt_delimiter
+        precision = self.general_settings.txt_precision
+        total_rows = self.output_data.shape[0]
+        with self._open() as stream: 
+            header = delimiter.join([str(column) for column in self.output_data.columns]) + os.linesep
+            stream.write(header.encode(TXT_ENCODING))
+            for start in range(0, total_rows, TXT_CHUNK_ROWS): 
+                chunk = self.output_data.iloc[start:start + TXT_CHUNK_ROWS]
+                columns = [txt_format.column_pieces(chunk.iloc[:, j], precision) for j in range(chunk.shape[1])]
+                stream.write(txt_format.encode(txt_format.join_lines(columns, delimiter, os.linesep), TXT_ENCODING))
+
+    def _open(self): 
+        """Opens the text file for writing, compressed with gzip if the 'TXT Gzip' general setting is on. 
+
+        Helper function to _make(). 
         """
-        mapping_df = self.get_str_timedelta()
-        mapping_array = mapping_df.to_numpy()
-        my_fmt = self._get_format()
 
-        #FIXME: tab delimiter looks weird on txt file
-        np.savetxt(self.get_name(), mapping_array, fmt = my_fmt, delimiter='\t', header = '\t'.join([str(column) for column in self.output_data.columns]), comments='')
+        if (self.general_settings.txt_gzip): 
+            return gzip.open(self.get_name(), 'wb', compresslevel = TXT_GZIP_LEVEL)
+        return open(self.get_name(), 'wb')
 
+class FeatherFile(File): 
+    """
+    Extends File to output a Feather (Arrow IPC) file of the processed CSV results. 
+
+    Unlike the text and Excel files, it keeps the dtypes of the columns, including the elapsed 
+    times, so it can be read back into a dataframe with pd.read_feather() without parsing. 
+    Writing it needs the optional pyarrow package. 
+    """
+
+    def get_name(self): 
+        return self.output_name + '.feather'
+
+    def will_output_file(self): 
+        return self.plan.feather
 
-    def _get_format(self) -> list: 
-        """Determine how to the data will be formatted in the text file."""
+    def output(self): 
+        """Outputs a Feather file."""
+
+        if (self.will_output_file()): 
+            self._make()
 
-        dtypes = self.output_data.dtypes
-        fmt = []
-        for i in range(len(dtypes)):
-            type = dtypes[i] 
-            if (type == np.int64): 
-                fmt.append('%d')
-            else:  # Parse floats as strings because %f truncates the length of the (very long!) floats. 
-                fmt.append('%s')
-        return fmt
+    def _make(self) -> None: 
+        """Generates a Feather file of the processed results, compressed with FEATHER_COMPRESSION. 
+
+        Helper function to output(). Feather needs string column labels, so the titles are converted. 
+        """
 
-      
-     
+        feather_df = self.output_data.rename(columns = str, copy = False)
+        feather_df.to_feather(self.get_name(), compression = FEATHER_COMPRESSION)
@@ -0,0 +1,190 @@
+import threading
+import numpy as np
+import pandas as pd
+from . import downsample
+from . import table_policy
+from .chart import Chart
+
+NANOSECONDS_PER_SECOND = 10 ** 9
+
+# Text of every minute and second of an hour, in %M:%S format
+MINUTE_SECOND_TEXT = np.array(['{:02d}:{:02d}'.format(*divmod(second, 60)) for second in range(3600)], dtype = object)
+
+class OutputPlan(object):
+    """
+    Decides once which output files and intermediate results are needed to process a CSV, and
+    computes every intermediate result shared by the output files at most once.
+
+    Attributes
+    ----------
+    mapped_settings: MappedSettings
+        Contains the mapped settings in the configuration file, resolved against the processed CSV
+    general_settings: GeneralSettings
+        Contains the general settings of the configuration file
+    output_data: pd.DataFrame
+        Dataframe of the processed CSV
+    chart : bool
+        True if the processed CSV is plotted on a chart
+    excel : bool
+        True if the Excel file is generated
+    jpeg : bool
+        True if the JPEG file is generated. It only holds the chart.
+    png : bool
+        True if the PNG file is generated. It only holds the chart.
+    svg : bool
+        True if the SVG file is generated. It only holds the chart.
+    pdf : bool
+        True if the PDF file is generated
+    chart_pdf : bool
+        True if the chart is drawn into the PDF file
+    txt : bool
+        True if the text file is generated
+    feather : bool
+        True if the Feather file is generated
+    """
+
+    def __init__(self, mapped_settings, general_settings, output_data):
+        self.mapped_settings = mapped_settings
+        self.general_settings = general_settings
+        self.output_data = output_data
+        self.chart = mapped_settings.has_chart
+        self.excel = general_settings.excel
+        self.jpeg = general_settings.jpeg and self.chart
+        self.png = general_settings.png and self.chart
+        self.svg = general_settings.svg and self.chart
+        self.pdf = general_settings.pdf
+        self.chart_pdf = self.pdf and self.chart
+        self.txt = general_settings.txt
+        self.feather = general_settings.feather
+        self._str_data = None
+        self._str_data_lock = threading.Lock()
+        self._chart_data = None
+        self._chart_data_lock = threading.Lock()
+        self._chart = None
+        self._chart_lock = threading.Lock()
+
+    def draw_chart(self) -> bool:
+        """Returns True if the chart is drawn with matplotlib (for the images and/or the PDF file), False if not."""
+
+        return self.jpeg or self.png or self.svg or self.chart_pdf
+
+    def get_str_data(self) -> pd.DataFrame:
+        """Returns the processed CSV with the elapsed times in %H:%M:%S format and the empty cells
+        replaced by a space.
+
+        It is built the first time the table of the PDF file asks for it, which may be from a
+        different thread than the other output files. It must not be modified.
+        """
+
+        with self._str_data_lock:
+            if (self._str_data is None):
+                self._str_data = self._make_str_data(self.output_data)
+            return self._str_data
+
+    def get_chart(self, title) -> Chart:
+        """Returns the matplotlib chart of the processed CSV.
+
+        It is drawn the first time it is asked for and shared by the image and PDF files, which
+        save it in their own format.
+
+        Parameters
+        ----------
+        title : str
+            Title of the chart
+        """
+
+        with self._chart_lock:
+            if (self._chart is None):
+                self._chart = Chart(self.mapped_settings, self.general_settings, self.get_chart_data(), title)
+            return self._chart
+
+    def get_chart_data(self) -> pd.DataFrame:
+        """Returns the rows of the processed CSV that the chart is drawn with.
+
+        If the 'Chart Points' general setting is given, long series are decimated to about that many
+        points with a min/max envelope of the y-axis columns, which keeps the peaks. Otherwise every
+        row is plotted. It is decided once and must not be modified.
+        """
+
+        with self._chart_data_lock:
+            if (self._chart_data is None):
+                self._chart_data = self.decimate(self.general_settings.chart_points)
+            return self._chart_data
+
+    def decimate(self, points) -> pd.DataFrame:
+        """Returns the rows of the processed CSV a chart of about 'points' points per series is drawn with.
+
+        Long series are decimated with a min/max envelope of the y-axis columns, which keeps the peaks.
+
+        Parameters
+        ----------
+        points : int or None
+            Number of points every series is drawn with, at most. None keeps every row.
+
+        Returns
+        -------
+        pd.DataFrame
+            The processed CSV itself if no rows are left out, otherwise the rows kept
+        """
+
+        if (points is None or self.output_data.shape[0] <= points):
+            return self.output_data
+        titles = self.mapped_settings.titles
+        columns = [self.output_data[titles[i]] for i in self.mapped_settings.y_axis_indices]
+        return self.output_data.iloc[downsample.min_max_positions(columns, points)]
+
+    def get_table_data(self) -> pd.DataFrame:
+        """Returns the rows of the processed CSV that go into the PDF table, as text, following the
+        'Table Policy' and 'Table Size' general settings. The index holds the labels of the rows.
+
+        Only the PDF table is bounded; the other output files hold every row.
+        """
+
+        policy = self.general_settings.table_policy
+        size = self.general_settings.table_size
+        total_rows = self.output_data.shape[0]
+        if (policy == 'FULL' or total_rows <= size):
+            return self.get_str_data()
+        if (policy == 'FIRST LAST'):
+            positions = table_policy.first_last_positions(total_rows, size)
+            return table_policy.insert_gap(self._make_str_data(self.output_data.iloc[positions]), size - size // 2)
+        if (policy == 'EVERY'):
+            return self._make_str_data(self.output_data.iloc[table_policy.every_kth_positions(total_rows, size)])
+        return self._make_str_data(table_policy.summary_rows(self.output_data, size))
+
+    def _make_str_data(self, output_data) -> pd.DataFrame:
+        """Converts timedelta objects into str representations in %H:%M:%S format.
+
+        Helper function to get_str_data() and get_table_data().
+        """
+
+        new_df = output_data.copy()
+        for i in self.mapped_settings.time_indices:
+            label = self.mapped_settings.columns[i].title
+            new_df[label] = self._format_timedelta(new_df[label])
+        return new_df.fillna(' ')
+
+    def _format_timedelta(self, timedelta_series) -> pd.Series:
+        """Formats a series of timedeltas as %H:%M:%S. Hours keep counting past a day.
+
+        The text of every minute and second of an hour, and of every hour, is made once and looked
+        up, so no value is formatted on its own.
+
+        Helper function to _make_str_data().
+        """
+
+        nanoseconds = timedelta_series.to_numpy(dtype = 'timedelta64[ns]')
+        valid = ~np.isnat(nanoseconds)
+        nanoseconds = nanoseconds[valid].astype(np.int64)
+        seconds = np.abs(nanoseconds) // NANOSECONDS_PER_SECOND
+        hours = seconds // 3600
+
+        str_series = pd.Series(np.nan, index = timedelta_series.index, dtype = object)
+        if (seconds.size == 0):
+            return str_series
+        hour_text = np.array(['{:02d}:'.format(hour) for hour in range(hours.max() + 1)], dtype = object)
+        text = hour_text[hours] + MINUTE_SECOND_TEXT[seconds % 3600]
+        if ((nanoseconds < 0).any()):
+            text = np.where(nanoseconds < 0, '-', '').astype(object) + text
+        str_series[valid] = text
+        return str_series
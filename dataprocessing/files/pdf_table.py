@@ -0,0 +1,223 @@
+import zlib
+
+# US Letter page in points (1/72 inch)
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+MARGIN = 36
+
+# Rows of data on every page, below the column titles
+ROWS_PER_PAGE = 40
+
+# Font sizes of the caption/page number and of the table cells. Cells shrink to fit wide tables.
+TITLE_FONT_SIZE = 12
+CELL_FONT_SIZE = 10
+MIN_CELL_FONT_SIZE = 5
+
+# Space between the text and the borders of a cell, as a fraction of the font size
+CELL_PADDING = 0.4
+
+# Helvetica-Bold, used for the column titles, is about this much wider than Helvetica
+BOLD_WIDTH_RATIO = 1.1
+
+# Widths of the Helvetica characters (in 1/1000 of the font size) that differ from the default width
+DEFAULT_CHAR_WIDTH = 556
+CHAR_WIDTHS = dict([(char, 278) for char in " !',./:;I[\\]fijlt|"] +
+                    [(char, 333) for char in '"()-`r{}'] +
+                    [(char, 584) for char in '+<=>~'] +
+                    [(char, 667) for char in 'ABEKPSVXY&'] +
+                    [(char, 722) for char in 'CDHNRUw'] +
+                    [(char, 778) for char in 'GOQ'] +
+                    [(char, 833) for char in 'Mm'] +
+                    [(char, 944) for char in 'W'] +
+                    [(char, 500) for char in 'ckszvxy'] +
+                    [(char, 611) for char in 'FTZ'])
+WIDE_CHARS = frozenset(char for char, width in CHAR_WIDTHS.items() if width > DEFAULT_CHAR_WIDTH)
+
+# Characters that have a special meaning in PDF strings
+ESCAPES = str.maketrans({'\\': '\\\\', '(': '\\(', ')': '\\)', '\r': ' ', '\n': ' '})
+
+class PDFTableWriter(object):
+    """
+    Writes a table into a PDF one page at a time, without holding more than a page in memory.
+
+    Every page holds a caption, the column titles (in bold), up to ROWS_PER_PAGE rows of data, and
+    the page number. Text is laid out directly with the standard Helvetica fonts, which every PDF
+    reader provides, so nothing is rendered or embedded.
+
+    Attributes
+    ----------
+    stream : file object
+        Binary file (or in-memory buffer) the PDF is written into
+    column_labels : list
+        Titles of the columns
+    column_widths : list
+        Widths of the columns in points
+    font_size : float
+        Font size of the table cells
+    caption : str
+        Text above the table on every page
+    page_number : int
+        Page number of the next page
+    """
+
+    def __init__(self, stream, column_labels, column_chars, caption = 'Table', first_page_number = 1):
+        """
+        Parameters
+        ----------
+        stream : file object
+            Binary file (or in-memory buffer) the PDF is written into
+        column_labels : list
+            Titles of the columns
+        column_chars : list
+            Widest text (in characters of the default width) in the data of every column
+        caption : str
+            Text above the table on every page
+        first_page_number : int
+            Page number of the first page
+        """
+
+        self.stream = stream
+        self.column_labels = [str(label) for label in column_labels]
+        self.caption = caption
+        self.page_number = first_page_number
+
+        # Shrink the cells until the table fits between the margins
+        column_chars = [max(chars, self.text_width(label) * BOLD_WIDTH_RATIO, 1) for chars, label in zip(column_chars, self.column_labels)]
+        chars = sum(column_chars) + 2 * CELL_PADDING * len(column_chars)
+        self.font_size = max(MIN_CELL_FONT_SIZE, min(CELL_FONT_SIZE, (PAGE_WIDTH - 2 * MARGIN) * 1000 / (chars * DEFAULT_CHAR_WIDTH)))
+        padding = 2 * CELL_PADDING * self.font_size
+        self.column_widths = [width * DEFAULT_CHAR_WIDTH * self.font_size / 1000 + padding for width in column_chars]
+        self._column_chars = column_chars
+        self._row_height = self.font_size * 1.6
+
+        # Text is placed relative to the previous cell, so the commands that move to the next cell or row never change
+        self._next_cell = ['{:.2f} 0 Td'.format(width) for width in self.column_widths[:-1]]
+        self._next_row = '{:.2f} {:.2f} Td'.format(-sum(self.column_widths[:-1]), -self._row_height)
+
+        # Object numbers 1 to 4 are written once the pages are known or right away
+        self._offsets = {}
+        self._page_objects = []
+        self._next_object = 5
+        self._position = 0
+        self._write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        self._write_object(3, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>')
+        self._write_object(4, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>')
+
+    @staticmethod
+    def text_width(text) -> float:
+        """Returns the width of the text in characters of the default width."""
+
+        return sum(CHAR_WIDTHS.get(char, DEFAULT_CHAR_WIDTH) for char in text) / DEFAULT_CHAR_WIDTH
+
+    def add_page(self, rows) -> None:
+        """Writes a page of the table.
+
+        Parameters
+        ----------
+        rows : list
+            Up to ROWS_PER_PAGE rows, each a list with the text of every cell
+        """
+
+        row_height = self._row_height
+        table_width = sum(self.column_widths)
+        left = (PAGE_WIDTH - table_width) / 2
+        top = PAGE_HEIGHT - 2 * MARGIN - TITLE_FONT_SIZE
+        bottom = top - row_height * (len(rows) + 1)
+
+        commands = []
+
+        # Caption and page number, centered
+        commands.append(self._centered_text(self.caption, PAGE_HEIGHT - MARGIN - TITLE_FONT_SIZE, '/F1', TITLE_FONT_SIZE))
+        commands.append(self._centered_text(str(self.page_number), MARGIN, '/F1', TITLE_FONT_SIZE))
+
+        # Cell borders
+        commands.append('0.5 w')
+        for i in range(len(rows) + 2):
+            y = top - i * row_height
+            commands.append('{:.2f} {:.2f} m {:.2f} {:.2f} l'.format(left, y, left + table_width, y))
+        x = left
+        for width in [0] + self.column_widths:
+            x += width
+            commands.append('{:.2f} {:.2f} m {:.2f} {:.2f} l'.format(x, top, x, bottom))
+        commands.append('S')
+
+        # Column titles in bold, then the rows of data
+        baseline = top - row_height + (row_height - self.font_size) / 2 + self.font_size * 0.2
+        commands.append('BT /F2 {:.2f} Tf 1 0 0 1 {:.2f} {:.2f} Tm'.format(self.font_size, left + CELL_PADDING * self.font_size, baseline))
+        commands.append(self._row_text(self.column_labels))
+        commands.append('/F1 {:.2f} Tf'.format(self.font_size))
+        for row in rows:
+            commands.append(self._next_row)
+            commands.append(self._row_text(row))
+        commands.append('ET')
+
+        content = zlib.compress('\n'.join(commands).encode('cp1252', 'replace'))
+        content_object = self._new_object()
+        self._write_object(content_object, b'<< /Length ' + str(len(content)).encode() + b' /Filter /FlateDecode >>\nstream\n' + content + b'\nendstream')
+        page_object = self._new_object()
+        self._write_object(page_object, ('<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {} {}] /Contents {} 0 R '
+                                        '/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> >>').format(PAGE_WIDTH, PAGE_HEIGHT, content_object).encode())
+        self._page_objects.append(page_object)
+        self.page_number += 1
+
+    def close(self) -> None:
+        """Writes the page tree and the cross-reference table that end the PDF. The stream is left open."""
+
+        kids = ' '.join('{} 0 R'.format(page) for page in self._page_objects)
+        self._write_object(2, '<< /Type /Pages /Kids [{}] /Count {} >>'.format(kids, len(self._page_objects)).encode())
+        self._write_object(1, b'<< /Type /Catalog /Pages 2 0 R >>')
+
+        xref_offset = self._position
+        lines = ['xref', '0 {}'.format(self._next_object), '0000000000 65535 f ']
+        for number in range(1, self._next_object):
+            lines.append('{:010d} 00000 n '.format(self._offsets[number]))
+        lines.append('trailer\n<< /Size {} /Root 1 0 R >>\nstartxref\n{}\n%%EOF\n'.format(self._next_object, xref_offset))
+        self._write('\n'.join(lines).encode())
+
+    def _row_text(self, cells) -> str:
+        """Returns the commands that draw a row of cells, starting at the first cell. Text that is too 
+        wide for its cell is cut off.
+
+        Helper function to add_page().
+        """
+
+        commands = []
+        for j, text in enumerate(cells):
+            if (j > 0):
+                commands.append(self._next_cell[j - 1])
+            text = str(text)
+
+            # Text of the default width fits as the columns were sized by the number of characters
+            if (len(text) > self._column_chars[j] or not WIDE_CHARS.isdisjoint(text)):
+                while (len(text) > 1 and self.text_width(text) > self._column_chars[j]):
+                    text = text[:-1]
+            commands.append('(' + text.translate(ESCAPES) + ') Tj')
+        return ' '.join(commands)
+
+    def _centered_text(self, text, baseline, font, font_size) -> str:
+        """Returns the commands that draw a line of text centered on the page.
+
+        Helper function to add_page().
+        """
+
+        width = self.text_width(text) * DEFAULT_CHAR_WIDTH * font_size / 1000
+        return 'BT {} {} Tf 1 0 0 1 {:.2f} {:.2f} Tm ({}) Tj ET'.format(font, font_size, (PAGE_WIDTH - width) / 2, baseline, text.translate(ESCAPES))
+
+    def _new_object(self) -> int:
+        """Returns the number of a new PDF object."""
+
+        number = self._next_object
+        self._next_object += 1
+        return number
+
+    def _write_object(self, number, body) -> None:
+        """Writes a PDF object and remembers where it starts for the cross-reference table."""
+
+        self._offsets[number] = self._position
+        self._write(str(number).encode() + b' 0 obj\n' + body + b'\nendobj\n')
+
+    def _write(self, data) -> None:
+        """Writes bytes into the stream and keeps track of the position in the PDF."""
+
+        self.stream.write(data)
+        self._position += len(data)
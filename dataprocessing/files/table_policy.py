@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+# Label of the row standing in for the rows left out by the 'First Last' policy
+GAP_LABEL = '...'
+
+def first_last_positions(total_rows, size) -> np.ndarray:
+    """Returns the positions of the first and last rows of the table. The first half comes from the start of the table.
+
+    Parameters
+    ----------
+    total_rows : int
+        Number of rows of the processed CSV
+    size : int
+        Number of rows kept
+
+    Returns
+    -------
+    np.ndarray
+        Positions of the rows kept, in order
+    """
+
+    last = size // 2
+    return np.r_[0:size - last, total_rows - last:total_rows]
+
+def insert_gap(str_df, position) -> pd.DataFrame:
+    """Returns the table with a row of '...' inserted before the given position, to show rows were left out.
+
+    Parameters
+    ----------
+    str_df : pd.DataFrame
+        Processed CSV as text
+    position : int
+        Position of the first row after the gap
+
+    Returns
+    -------
+    pd.DataFrame
+        Table with the gap row
+    """
+
+    gap = pd.DataFrame([[GAP_LABEL] * str_df.shape[1]], columns = str_df.columns, index = [GAP_LABEL])
+    return pd.concat([str_df.iloc[:position], gap, str_df.iloc[position:]])
+
+def every_kth_positions(total_rows, size) -> np.ndarray:
+    """Returns the positions of every k-th row of the table, with k chosen so at most 'size' rows are kept.
+
+    Parameters
+    ----------
+    total_rows : int
+        Number of rows of the processed CSV
+    size : int
+        Maximum number of rows kept
+
+    Returns
+    -------
+    np.ndarray
+        Positions of the rows kept, starting at the first row
+    """
+
+    step = -(-total_rows // size)
+    return np.arange(0, total_rows, step)
+
+def summary_rows(output_data, size) -> pd.DataFrame:
+    """Summarizes the processed CSV in 'size' intervals of consecutive rows.
+
+    Every interval becomes a single row labeled with its first and last row numbers. Numeric
+    columns hold the mean of the interval; every other column (e.g. elapsed times) holds the
+    first value of the interval.
+
+    Parameters
+    ----------
+    output_data : pd.DataFrame
+        Processed CSV
+    size : int
+        Number of intervals
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per interval, with the same columns and dtypes as output_data
+    """
+
+    total_rows = output_data.shape[0]
+    intervals = np.arange(total_rows) * size // total_rows
+    grouped = output_data.groupby(intervals, sort = True)
+
+    summary = pd.DataFrame(index = grouped.size().index)
+    for label in output_data.columns:
+        column = output_data[label]
+        if (pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column)):
+            summary[label] = grouped[label].mean()
+        else:
+            summary[label] = grouped[label].first()
+
+    # Label every interval with its row numbers
+    starts = np.searchsorted(intervals, summary.index, side = 'left')
+    ends = np.searchsorted(intervals, summary.index, side = 'right') - 1
+    summary.index = [str(start) + '-' + str(end) for start, end in zip(starts, ends)]
+    return summary
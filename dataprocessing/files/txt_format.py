@@ -0,0 +1,355 @@
+import numpy as np
+import pandas as pd
+
+# Every column is converted into pieces of text. A piece is a matrix of character codes, one column
+# per cell, and a mask of the characters the cells are made of. The pieces of a chunk of rows are
+# stacked with the delimiters and line endings, and the masked characters are read off cell by cell,
+# which joins the cells into lines without handling any value on its own. Keeping the cells in
+# columns makes every piece a block of contiguous memory, which is much faster to stack.
+
+NANOSECONDS_PER_SECOND = 10 ** 9
+
+# Floats are written like repr() (the shortest text that reads back as the same float). Floats of
+# up to MAX_DECIMALS decimal places are written with integer arithmetic, every other float with repr().
+MAX_DECIMALS = 15
+
+# Largest scaled float (the digits as an integer) written with integer arithmetic, well within the
+# integers a float holds exactly
+MAX_SCALED_FLOAT = 2 ** 50
+
+# repr() writes floats in scientific notation outside of this range
+MIN_POSITIONAL_FLOAT = 1e-4
+MAX_POSITIONAL_FLOAT = 1e16
+
+POWERS_OF_TEN = 10 ** np.arange(20, dtype = np.uint64)
+
+# Splits a float into two halves of 26 bits, whose products with each other are exact (Dekker)
+SPLITTER = 2.0 ** 27 + 1
+ZERO = ord('0')
+
+# Character codes of every minute and second of an hour in %M:%S format, one column per second
+MINUTE_SECOND_CHARS = np.frombuffer(''.join('{:02d}:{:02d}'.format(*divmod(second, 60)) for second in range(3600)).encode('ascii'),
+                                    dtype = np.uint8).reshape(3600, 5).T.copy()
+
+def column_pieces(column, precision = None) -> list:
+    """Returns the pieces of text of every cell of a column. Empty cells are a space.
+
+    Parameters
+    ----------
+    column : pd.Series
+        Column of the processed CSV
+    precision : int or None
+        Decimal places floats are written with. None writes them like repr().
+
+    Returns
+    -------
+    list
+        Pieces of text, each a tuple of character codes and mask of shape (width, rows)
+    """
+
+    values = column.to_numpy()
+    empty = column.isnull().to_numpy()
+    if (pd.api.types.is_timedelta64_dtype(column)):
+        pieces = timedelta_pieces(values)
+    elif (values.dtype.kind == 'f'):
+        pieces = float_pieces(values, precision)
+    elif (values.dtype.kind in 'iu'):
+        pieces = int_pieces(values)
+    elif (values.dtype.kind == 'b'):
+        pieces = [str_piece(np.where(values, 'True', 'False'))]
+    else:
+        pieces = _rows_only([str_piece(column.astype(str).to_numpy())], ~empty)
+    return pieces + [text_piece(' ', empty)]
+
+def int_pieces(values) -> list:
+    """Returns the pieces of text of integers.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Signed or unsigned integers
+
+    Returns
+    -------
+    list
+        Pieces of text, each a tuple of character codes and mask of shape (width, rows)
+    """
+
+    if (values.dtype.kind == 'u'):
+        return [_digit_piece(values.astype(np.uint64), 1)]
+    magnitude = np.abs(values.astype(np.int64)).astype(np.uint64)
+    return [text_piece('-', values < 0), _digit_piece(magnitude, 1)]
+
+def float_pieces(values, precision = None) -> list:
+    """Returns the pieces of text of floats. NaNs are left out, so their cells are empty.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Floats
+    precision : int or None
+        Decimal places every float is rounded to and written with. None writes the floats like repr().
+
+    Returns
+    -------
+    list
+        Pieces of text, each a tuple of character codes and mask of shape (width, rows)
+    """
+
+    values = values.astype(np.float64)
+    rows = values.shape[0]
+    finite = np.isfinite(values)
+    magnitude = np.abs(np.where(finite, values, 0))
+
+    if (precision is None):
+        # Find the fewest decimal places that give back the same float, which is what repr() writes.
+        # repr() switches to scientific notation for very small and very large floats.
+        decimals = np.full(rows, -1, dtype = np.int64)
+        scaled = np.zeros(rows, dtype = np.float64)
+        positional = finite & ((magnitude == 0) | ((magnitude >= MIN_POSITIONAL_FLOAT) & (magnitude < MAX_POSITIONAL_FLOAT)))
+        candidates = np.flatnonzero(positional)
+        for places in range(MAX_DECIMALS + 1):
+            if (candidates.size == 0):
+                break
+            scale = 10.0 ** places
+            rounded = np.rint(magnitude[candidates] * scale)
+            in_range = rounded < MAX_SCALED_FLOAT
+            found = in_range & (rounded / scale == magnitude[candidates])
+            decimals[candidates[found]] = places
+            scaled[candidates[found]] = rounded[found]
+
+            # Floats too large to scale any further are written with repr()
+            candidates = candidates[in_range & ~found]
+        fast = decimals >= 0
+    elif (precision <= MAX_DECIMALS):
+        # Floats too large to scale are left out first, so they cannot overflow
+        decimals = np.full(rows, precision, dtype = np.int64)
+        scale = 10.0 ** precision
+        in_range = finite & (magnitude < MAX_SCALED_FLOAT)
+        magnitude = np.where(in_range, magnitude, 0)
+        product = magnitude * scale
+        scaled = np.rint(product)
+
+        # Rounding the product in float arithmetic and then to an integer rounds twice, which is wrong
+        # for the few floats whose product lies within its rounding error of half way between integers
+        fast = in_range & (scaled < MAX_SCALED_FLOAT) & ~_near_half(magnitude, scale, product)
+    else:
+        # Too many decimal places for integer arithmetic, so every float is written with format()
+        decimals = np.full(rows, precision, dtype = np.int64)
+        scaled = np.zeros(rows, dtype = np.float64)
+        fast = np.zeros(rows, dtype = bool)
+
+    # Whole part, decimal point, and decimal places, which are a single '0' for whole floats like repr()
+    pieces = []
+    if (fast.any()):
+        scaled = np.where(fast, scaled, 0).astype(np.uint64)
+        decimals = np.where(fast, decimals, 0)
+        powers = POWERS_OF_TEN[decimals]
+        min_places = 1 if precision is None else precision
+        pieces = [text_piece('-', np.signbit(values)), _digit_piece(scaled // powers, 1)]
+        if (min_places > 0):
+            pieces += [text_piece('.', fast), _decimal_piece(scaled % powers, decimals, min_places)]
+        pieces = _rows_only(pieces, fast)
+
+    # Floats that cannot be written with integer arithmetic are written one at a time
+    slow = ~fast & ~np.isnan(values)
+    if (slow.any()):
+        if (precision is None):
+            text = [repr(value) for value in values[slow].tolist()]
+        else:
+            text = ['{:.{}f}'.format(value, precision) for value in values[slow].tolist()]
+        all_text = np.full(rows, '', dtype = object)
+        all_text[slow] = text
+        pieces.append(str_piece(all_text.astype(str)))
+    return pieces
+
+def timedelta_pieces(values) -> list:
+    """Returns the pieces of text of timedeltas in %H:%M:%S format. Hours keep counting past a day,
+    and fractions of a second are cut off. NaTs are left out, so their cells are empty.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        timedelta64 values
+
+    Returns
+    -------
+    list
+        Pieces of text, each a tuple of character codes and mask of shape (width, rows)
+    """
+
+    values = values.astype('timedelta64[ns]')
+    valid = ~np.isnat(values)
+    nanoseconds = np.where(valid, values.astype(np.int64), 0)
+    seconds = np.abs(nanoseconds) // NANOSECONDS_PER_SECOND
+    minutes_seconds = np.take(MINUTE_SECOND_CHARS, seconds % 3600, axis = 1)
+
+    return _rows_only([text_piece('-', nanoseconds < 0),
+                       _digit_piece((seconds // 3600).astype(np.uint64), 2),
+                       text_piece(':', valid),
+                       (minutes_seconds, np.broadcast_to(True, minutes_seconds.shape))], valid)
+
+def str_piece(text) -> tuple:
+    """Returns the piece of text of strings.
+
+    Parameters
+    ----------
+    text : np.ndarray
+        Unicode strings
+
+    Returns
+    -------
+    tuple
+        Character codes and mask of shape (width, rows)
+    """
+
+    text = np.asarray(text, dtype = str)
+    width = max(text.dtype.itemsize // 4, 1)
+    chars = np.ascontiguousarray(text.astype('<U{}'.format(width))).view(np.uint32).reshape(text.shape[0], width).T
+    mask = chars != 0
+
+    # ASCII text takes a quarter of the memory
+    if (chars.size == 0 or chars.max() < 128):
+        chars = chars.astype(np.uint8)
+    return chars, mask
+
+def text_piece(text, rows) -> tuple:
+    """Returns the piece of the same text in some rows, e.g. a delimiter.
+
+    Parameters
+    ----------
+    text : str
+        ASCII text
+    rows : np.ndarray
+        True for the rows that hold the text
+
+    Returns
+    -------
+    tuple
+        Character codes and mask of shape (width, rows)
+    """
+
+    chars = np.frombuffer(text.encode('ascii'), dtype = np.uint8)[:, None]
+    shape = (chars.shape[0], rows.shape[0])
+    return np.broadcast_to(chars, shape), np.broadcast_to(rows, shape)
+
+def join_lines(columns, delimiter, line_ending) -> np.ndarray:
+    """Joins the cells of every row into lines.
+
+    Parameters
+    ----------
+    columns : list
+        Pieces of text of every column
+    delimiter : str
+        Text between the columns
+    line_ending : str
+        Text at the end of every line
+
+    Returns
+    -------
+    np.ndarray
+        Character codes of the lines, one after another
+    """
+
+    every_row = np.ones(columns[0][0][0].shape[1], dtype = bool)
+    pieces = []
+    for j, column in enumerate(columns):
+        if (j > 0):
+            pieces.append(_any_text_piece(delimiter, every_row))
+        pieces += column
+    pieces.append(_any_text_piece(line_ending, every_row))
+    chars = np.vstack([chars for chars, mask in pieces])
+    mask = np.vstack([mask for chars, mask in pieces])
+    return chars.T[mask.T]
+
+def encode(chars, encoding) -> bytes:
+    """Encodes character codes into bytes. ASCII text is copied straight into bytes."""
+
+    if (chars.size == 0 or chars.max() < 128):
+        return chars.astype(np.uint8).tobytes()
+    return chars.astype('<u4').tobytes().decode('utf-32-le').encode(encoding)
+
+def _any_text_piece(text, rows) -> tuple:
+    """Returns the piece of the same text in some rows, which may hold any character.
+
+    Helper function to join_lines().
+    """
+
+    if (text.isascii()):
+        return text_piece(text, rows)
+    return _rows_only([str_piece(np.full(rows.shape[0], text))], rows)[0]
+
+def _near_half(values, scale, product) -> np.ndarray:
+    """Returns True for the floats whose product with 'scale' may round to a different integer than
+    the exact product does, as it lies within its rounding error of half way between two integers.
+
+    Helper function to float_pieces().
+    """
+
+    # The rounding error of every product, from the halves of its factors (Dekker's algorithm)
+    values_high, values_low = _split(values)
+    scale_high, scale_low = _split(np.float64(scale))
+    error = ((values_high * scale_high - product) + values_high * scale_low + values_low * scale_high) + values_low * scale_low
+    return (error != 0) & (np.abs(product - np.floor(product) - 0.5) <= np.abs(error))
+
+def _split(values) -> tuple:
+    """Splits floats into a high and a low half that add up to them exactly.
+
+    Helper function to _near_half().
+    """
+
+    high = SPLITTER * values
+    high = high - (high - values)
+    return high, values - high
+
+def _digit_piece(values, min_digits) -> tuple:
+    """Returns the digits of unsigned integers, with leading zeros up to 'min_digits' digits.
+
+    Helper function to int_pieces(), float_pieces() and timedelta_pieces().
+    """
+
+    width = max(min_digits, len(str(int(values.max()))) if values.shape[0] > 0 else 1)
+    chars, significant = _digit_chars(values, width)
+    significant[width - min_digits:] = True
+    return chars, significant
+
+def _decimal_piece(values, decimals, min_places) -> tuple:
+    """Returns the decimal places of floats, where 'values' holds the decimal places as integers.
+    Floats with fewer than 'min_places' decimal places are padded with zeros.
+
+    Helper function to float_pieces().
+    """
+
+    places = np.maximum(decimals, min_places)
+    width = max(min_places, int(places.max()) if values.shape[0] > 0 else 0)
+
+    # Shift the decimal places to the left of 'width' digits, so the padding zeros are trailing digits
+    chars = _digit_chars(values * POWERS_OF_TEN[width - decimals], width)[0]
+    return chars, np.arange(width)[:, None] < places
+
+def _digit_chars(values, width) -> tuple:
+    """Returns the last 'width' digits of unsigned integers as character codes of shape (width, rows),
+    and whether every digit is significant, i.e. not a leading zero.
+
+    Helper function to _digit_piece() and _decimal_piece().
+    """
+
+    # Integer division is much faster on 32-bit integers
+    rest = values.astype(np.uint32 if values.shape[0] == 0 or values.max() < 2 ** 32 else np.uint64)
+    chars = np.empty((width, values.shape[0]), dtype = np.uint8)
+    significant = np.empty((width, values.shape[0]), dtype = bool)
+    for j in range(width - 1, -1, -1):
+        np.not_equal(rest, 0, out = significant[j])
+        quotient = rest // 10
+        np.subtract(rest, quotient * 10, out = chars[j], casting = 'unsafe')
+        rest = quotient
+    chars += ZERO
+    return chars, significant
+
+def _rows_only(pieces, rows) -> list:
+    """Leaves the other rows out of the pieces of text.
+
+    Helper function to column_pieces(), float_pieces(), timedelta_pieces() and _any_text_piece().
+    """
+
+    return [(chars, mask & rows) for chars, mask in pieces]
@@ -1,4 +1,3 @@
-from openpyxl import load_workbook
 class UserInterface (object):
     """A class that serves as the text-based user interface"""
 
@@ -11,10 +10,10 @@ class UserInterface (object):
         print('*****************************')
 
     def choose_config(self):
-        """Returns a list that contains the workbook itself as well as the name of the configuration file"""
+        """Asks the user for the name of the configuration file"""
         config_file = input('Enter name of configuration file: ')
 
-        return [load_workbook(config_file + '.xlsx'), config_file]
+        return config_file
 
 
     def choose_csv(self):
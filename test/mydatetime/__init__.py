@@ -1 +0,0 @@
-from .functions import search_for_military_times, date_parser
\ No newline at end of file
@@ -1,43 +1,66 @@
+import os
+import sys
 import unittest
 import pandas as pd
 import numpy.testing as npt
-import mydatetime 
 
-class TestZeroSeconds(unittest.TestCase): 
-    def setUp(self): 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dataprocessing'))
+import dataframes
+
+def csv_dataframe(df):
+    """Returns a CSVDataFrame that holds an already read CSV."""
+
+    csv_df = dataframes.CSVDataFrame('mydatetime', df, None, None, 'mydatetime')
+    csv_df.df = df
+    return csv_df
+
+class TestZeroSeconds(unittest.TestCase):
+    def setUp(self):
         # Load test data
         #self.df = pd.read_csv(r'C:\Users\Cathy Hsu\Light and Motion\data_processing\tests\fixtures\test_datetime_zero.csv')
         self.df = pd.read_csv('mydatetime/test_datetime_zero.csv')
-    def test_count(self): 
+    def test_count(self):
         self.assertEqual(self.df.size, 6)
-    def test_type(self): 
+    def test_type(self):
         self.assertEqual(type(self.df['StartTime1']), pd.Series)
-    def test_column_label(self): 
+    def test_column_label(self):
         self.assertEqual(self.df.columns[0], 'StartTime1')
-    def test_search_for_military_times(self): 
-        self.assertEqual(mydatetime.search_for_military_times(self.df), ['StartTime1'])
-    def test_date_parser(self): 
-        npt.assert_array_equal(mydatetime.date_parser(self.df['StartTime1']).to_numpy(), self.df['StartTime2'].to_numpy())
-    
-class TestNonzeroSeconds(unittest.TestCase): 
-    def setUp(self): 
+    def test_search_for_military_times(self):
+        self.assertEqual(csv_dataframe(self.df)._search_for_military_times(), {'StartTime1': '%m/%d/%Y %H:%M', 'StartTime2': '%m/%d/%Y %I:%M:%S %p'})
+    def test_date_parser(self):
+        npt.assert_array_equal(csv_dataframe(self.df)._date_parser(self.df['StartTime1'], '%m/%d/%Y %H:%M').to_numpy(), self.df['StartTime2'].to_numpy())
+
+class TestNonzeroSeconds(unittest.TestCase):
+    def setUp(self):
         self.df = pd.read_csv('mydatetime/test_datetime_nonzero.csv')
-    def test_search_for_military_times(self): 
-        self.assertEqual(mydatetime.search_for_military_times(self.df), ['StartTime1'])
-    def test_date_parser(self): 
-        npt.assert_array_equal(mydatetime.date_parser(self.df['StartTime1']).to_numpy(), self.df['StartTime2'].to_numpy())
+    def test_search_for_military_times(self):
+        self.assertEqual(csv_dataframe(self.df)._search_for_military_times(), {'StartTime1': '%m/%d/%Y %H:%M:%S', 'StartTime2': '%m/%d/%Y %I:%M:%S %p'})
+    def test_date_parser(self):
+        npt.assert_array_equal(csv_dataframe(self.df)._date_parser(self.df['StartTime1'], '%m/%d/%Y %H:%M:%S').to_numpy(), self.df['StartTime2'].to_numpy())
 
 
-class TestMicroSeconds(unittest.TestCase): 
-    def setUp(self): 
+class TestMicroSeconds(unittest.TestCase):
+    def setUp(self):
         self.df = pd.read_csv('mydatetime/test_datetime_microseconds.csv')
-    def test_search_for_military_times(self): 
-            self.assertEqual(mydatetime.search_for_military_times(self.df), ['StartTime1'])
-    def test_date_parser(self): 
-        npt.assert_array_equal(mydatetime.date_parser(self.df['StartTime1']).to_numpy(), self.df['StartTime2'].to_numpy())
+    def test_search_for_military_times(self):
+        self.assertEqual(csv_dataframe(self.df)._search_for_military_times(), {'StartTime1': '%m/%d/%Y %H:%M:%S.%f', 'StartTime2': '%m/%d/%Y %I:%M:%S.%f %p'})
+    def test_date_parser(self):
+        npt.assert_array_equal(csv_dataframe(self.df)._date_parser(self.df['StartTime1'], '%m/%d/%Y %H:%M:%S.%f').to_numpy(), self.df['StartTime2'].to_numpy())
+
+class TestPeriods(unittest.TestCase):
+    def setUp(self):
+        # Every row gets its own period, also after a PM time, and the dates are kept as they are written
+        self.df = pd.DataFrame({'StartTime1': ['02/05/2018 13:30:12', '02/05/2018 09:15', '2/6/2018 00:05:00', '2/6/2018 12:00:00.5', '', 'N/A'],
+                                'StartTime2': ['02/05/2018 1:30:12 PM', '02/05/2018 9:15:00 AM', '2/6/2018 12:05:00 AM', '2/6/2018 12:00:00.5 PM', '', 'N/A']})
+    def test_date_parser(self):
+        npt.assert_array_equal(csv_dataframe(self.df)._date_parser(self.df['StartTime1']).to_numpy(), self.df['StartTime2'].to_numpy())
+    def test_search_skips_blank_first_row(self):
+        df = pd.DataFrame({'StartTime1': ['', '02/05/2018 13:30:12', '02/05/2018 14:30:12'], 'Value': [1, 2, 3]})
+        self.assertEqual(csv_dataframe(df)._search_for_military_times(), {'StartTime1': '%m/%d/%Y %H:%M:%S'})
+    def test_search_needs_every_sampled_value(self):
+        self.assertEqual(csv_dataframe(self.df[['StartTime1']])._search_for_military_times(), {})
 
 
 
-if __name__ == '__main__': 
+if __name__ == '__main__':
     unittest.main()
-    
\ No newline at end of file
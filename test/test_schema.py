@@ -0,0 +1,79 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dataprocessing'))
+import config
+import dataframes
+
+HEADER = 'Time,Count,Status,Value,Flag,Start\n'
+
+# Pairs of CSVs with the same layout, whose columns get different dtypes from their values
+CSV_PAIRS = {
+    'empty cell, then integers': ('1,1,OK,1.5,True,02/15/2018 13:27\n'
+                                  '2,,OK,2,False,02/15/2018 13:28\n'
+                                  '3,3,OK,2.5,True,02/15/2018 13:29\n'
+                                  '4,4,BAD,3,True,02/15/2018 13:30\n',
+                                  '1,1,10,1,1,02/15/2018 13:27:00.5\n'
+                                  '2,2,20,2,0,02/15/2018 13:28:01\n'
+                                  '3,3,10,3,1,02/15/2018 13:29:02\n'
+                                  '4,4,20,4,0,02/15/2018 13:30:03\n'),
+    'integers, then decimals': ('1,1,10,1,1,02/15/2018 13:27\n'
+                                '2,2,20,2,0,02/15/2018 13:28\n'
+                                '3,3,10,3,1,02/15/2018 13:29\n',
+                                '1,1.0,1.5,1.0,x,\n'
+                                '2,,2.5,2.0,y,\n'
+                                '3,70000,OK,3.0,z,\n'),
+}
+
+# Format of the military datetimes of the first CSV of every pair
+MILITARY_FORMAT = '%m/%d/%Y %H:%M'
+
+class TestSchema(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.general_settings = config.GeneralSettings()
+        self.mapped_settings = config.MappedSettings(tuple(config.MappedSetting(i, i) for i in range(1, 7)))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def create(self, name, contents, cache = None):
+        """Writes the CSV and returns its cleaned dataframe."""
+
+        file_name = os.path.join(self.directory, name)
+        with open(file_name + '.csv', 'w') as csv:
+            csv.write(HEADER + contents)
+        csv_df = dataframes.CSVDataFrame(file_name, pd.DataFrame(), self.mapped_settings, self.general_settings, name, cache)
+        csv_df.create()
+        return csv_df
+
+    def test_schema_path_equals_inference(self):
+        for description, contents in CSV_PAIRS.items():
+            with self.subTest(description):
+                cache = dataframes.CSVCache(os.path.join(self.directory, 'cache_' + str(len(description))))
+                self.assertIsNone(self.create('first', contents[0], cache).schema)
+                known = self.create('second', contents[1], cache)
+                self.assertIsNotNone(known.schema)
+                self.assertEqual(known.schema.labels, HEADER.strip().split(','))
+                self.assertEqual(known.schema.datetime_formats, {'Start': MILITARY_FORMAT})
+                inferred = self.create('second', contents[1])
+                pd.testing.assert_frame_equal(known.df, inferred.df)
+                self.assertEqual(known.datetime_formats, inferred.datetime_formats)
+
+    def test_stored_schema(self):
+        schemas = dataframes.schema.SchemaCache(self.directory)
+        key = schemas.key(['Time', 'Start', 'Value'])
+        schemas.save(key, dataframes.schema.Schema(['Time', 'Start'], {'Start': '%m/%d/%Y %H:%M'}))
+        schemas.save(key, dataframes.schema.Schema(['Time', 'Value'], {}))
+        with open(os.path.join(self.directory, key + '.json')) as schema_file:
+            self.assertEqual(json.load(schema_file), {'labels': ['Start', 'Time', 'Value'], 'datetime_formats': {'Start': '%m/%d/%Y %H:%M'}})
+        self.assertTrue(schemas.load(key).covers(['Start', 'Value']))
+        self.assertFalse(schemas.load(key).covers(['Other']))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+DATAPROCESSING_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dataprocessing')
+
+# Seconds it may take to import everything a job needs. Measured at about 0.7 s, 1.5 s before matplotlib was imported lazily.
+# Wall-clock time depends on the machine, so the startup is only timed when this environment variable is set.
+STARTUP_TARGET_SECONDS = 1.2
+STARTUP_BENCHMARK_VARIABLE = 'STARTUP_BENCHMARK'
+
+# Modules that are only needed by some of the output files
+LAZY_MODULES = ['matplotlib', 'matplotlib.pyplot', 'PyPDF2']
+
+def import_modules(*modules):
+    """Imports the modules in a fresh interpreter. Returns the seconds it took and the modules that got loaded."""
+
+    code = ('import json, sys, time\n'
+            'start = time.perf_counter()\n'
+            + ''.join('import {}\n'.format(module) for module in modules) +
+            'print(json.dumps([time.perf_counter() - start, list(sys.modules)]))')
+    output = subprocess.run([sys.executable, '-c', code], cwd = DATAPROCESSING_DIR,
+                            stdout = subprocess.PIPE, check = True, universal_newlines = True).stdout
+    return json.loads(output.splitlines()[-1])
+
+class TestLazyImports(unittest.TestCase):
+    def test_entry_point(self):
+        loaded = import_modules('data_processing')[1]
+        self.assertNotIn('pandas', loaded)
+    def test_job_modules(self):
+        loaded = import_modules('batch')[1]
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, loaded)
+
+@unittest.skipUnless(os.environ.get(STARTUP_BENCHMARK_VARIABLE), 'set {}=1 to time the startup'.format(STARTUP_BENCHMARK_VARIABLE))
+class TestStartupTime(unittest.TestCase):
+    def test_startup_time(self):
+        # Best of three, so a busy machine does not fail the benchmark
+        seconds = min(import_modules('data_processing', 'batch')[0] for i in range(3))
+        print('Startup: {:.2f} s (target {:.2f} s)'.format(seconds, STARTUP_TARGET_SECONDS))
+        self.assertLess(seconds, STARTUP_TARGET_SECONDS)
+
+if __name__ == '__main__':
+    unittest.main()
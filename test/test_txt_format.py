@@ -0,0 +1,67 @@
+import os
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dataprocessing'))
+from files import txt_format
+
+EDGE_FLOATS = [0.0, -0.0, np.inf, -np.inf, np.nan, 1e16, -1e16, 9999999999999998.0, 1e-4, -1e-4, 9.999999999999999e-05,
+               0.1, 1 / 3, 2 / 3, 0.125, 0.375, 2.5, 3.5, 1e300, -1e300, 5e-324, 2.0 ** 50, 2.0 ** 53 + 2,
+               10029708363291.635, 4727479785281.555, 123456.789, -0.001]
+
+EDGE_INTS = [0, 1, -1, 9, 10, -10, 2 ** 31, -2 ** 31, 2 ** 32, 2 ** 63 - 1, -2 ** 63]
+
+def write(values, precision = None) -> list:
+    """Returns the text of every cell of a column."""
+
+    pieces = txt_format.column_pieces(pd.Series(values), precision)
+    lines = txt_format.encode(txt_format.join_lines([pieces], '\t', '\n'), 'utf-8').decode('utf-8')
+    return lines.split('\n')[:-1]
+
+def random_floats() -> np.ndarray:
+    """Returns floats of every magnitude the fast paths handle, and some they do not."""
+
+    rng = np.random.default_rng(0)
+    floats = rng.random(20000) * 10.0 ** rng.integers(-6, 18, 20000)
+    return np.where(rng.random(20000) < 0.5, -floats, floats)
+
+class TestFloats(unittest.TestCase):
+    def test_repr(self):
+        values = np.concatenate([EDGE_FLOATS, random_floats()])
+        expected = [' ' if np.isnan(value) else repr(value) for value in values.tolist()]
+        self.assertEqual(write(values), expected)
+    def test_precision(self):
+        values = np.concatenate([EDGE_FLOATS, random_floats()])
+        for precision in (0, 1, 2, 6, 15, 16, 20):
+            with self.subTest(precision = precision):
+                expected = [' ' if np.isnan(value) else '{:.{}f}'.format(value, precision) for value in values.tolist()]
+                self.assertEqual(write(values, precision), expected)
+    def test_no_overflow_warning(self):
+        with np.errstate(all = 'raise'):
+            write(np.array(EDGE_FLOATS), 2)
+    def test_float32(self):
+        values = np.array([0.5, -1.25, np.nan, 3.0], dtype = np.float32)
+        self.assertEqual(write(values), ['0.5', '-1.25', ' ', '3.0'])
+
+class TestIntegers(unittest.TestCase):
+    def test_int64(self):
+        values = np.array(EDGE_INTS, dtype = np.int64)
+        self.assertEqual(write(values), [str(value) for value in EDGE_INTS])
+    def test_uint64(self):
+        values = np.array([0, 1, 2 ** 63, 2 ** 64 - 1], dtype = np.uint64)
+        self.assertEqual(write(values), ['0', '1', str(2 ** 63), str(2 ** 64 - 1)])
+    def test_int8(self):
+        values = np.array([-128, 0, 127], dtype = np.int8)
+        self.assertEqual(write(values), ['-128', '0', '127'])
+
+class TestOtherColumns(unittest.TestCase):
+    def test_timedelta(self):
+        values = pd.to_timedelta(['0s', '59s', '3599s', '1 days 00:00:01', '-61s', None, '0.9s'])
+        self.assertEqual(write(values), ['00:00:00', '00:00:59', '00:59:59', '24:00:01', '-00:01:01', ' ', '00:00:00'])
+    def test_str(self):
+        self.assertEqual(write(pd.Series(['a', None, 'µs', 'long text'], dtype = object)), ['a', ' ', 'µs', 'long text'])
+
+if __name__ == '__main__':
+    unittest.main()